@@ -7,101 +7,74 @@ Enhanced chatbot with live chat display, better formatting, and advanced feature
 
 import sys
 import os
-import json
-import datetime
-from typing import List, Dict, Optional
-from dataclasses import dataclass, asdict
+import array
+from collections import deque
+from typing import List, Dict, Optional, Tuple
 from pathlib import Path
 
 # Add the current directory to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from command_mapper import CommandMapper
-from executor import CommandExecutor
-from rich.console import Console
+from chatbot import _BaseChatbot, ChatMessage, console, _format_timestamp, _truncate
 from rich.panel import Panel
 from rich.text import Text
-from rich.prompt import Prompt
-from rich.syntax import Syntax
 from rich.table import Table
-from rich.layout import Layout
-from rich.live import Live
-from rich.align import Align
-from rich.columns import Columns
-from rich.rule import Rule
 
-console = Console()
+# Indices into AdvancedChatbotInterface._counters
+TOTAL_COMMANDS, SUCCESSFUL_COMMANDS, FAILED_COMMANDS, AI_USED, FALLBACK_USED = range(5)
+_STAT_KEYS = ("total_commands", "successful_commands", "failed_commands", "ai_used", "fallback_used")
 
-@dataclass
-class ChatMessage:
-    """Represents a chat message."""
-    timestamp: str
-    user_input: str
-    mapped_command: Optional[str]
-    execution_result: Optional[str]
-    success: bool
-    message_type: str  # 'user', 'assistant', 'system', 'error'
-
-class AdvancedChatbotInterface:
+class AdvancedChatbotInterface(_BaseChatbot):
     """Advanced interactive chatbot interface for AI Command Generator."""
     
-    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-3.5-turbo"):
-        self.command_mapper = CommandMapper(api_key=api_key, model=model)
-        self.executor = CommandExecutor()
-        self.conversation_history: List[ChatMessage] = []
-        self.chat_history_file = Path("advanced_chat_history.json")
-        self.load_chat_history()
+    _result_type = "assistant"
+    
+    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4o-mini"):
+        super().__init__(Path("advanced_chat_history.jsonl"), api_key=api_key, model=model)
         
-        # Chatbot personality
-        self.bot_name = "🤖 AI Command Assistant"
-        self.welcome_message = "Hello! I'm your AI command assistant. I can help you convert natural language to system commands. Just tell me what you want to do!"
+        # Rendered panels are cached until the data behind them changes
+        self._header_panel: Optional[Panel] = None
+        self._stats_panel: Optional[Panel] = None
         
         # Statistics
-        self.stats = {
-            "total_commands": 0,
-            "successful_commands": 0,
-            "failed_commands": 0,
-            "ai_used": 0,
-            "fallback_used": 0
-        }
+        self._counters = array.array('q', [0] * len(_STAT_KEYS))
+        
+        self._special_commands['stats'] = self._cmd_stats
         
     def load_chat_history(self):
         """Load chat history from file."""
-        if self.chat_history_file.exists():
-            try:
-                with open(self.chat_history_file, 'r') as f:
-                    data = json.load(f)
-                    self.conversation_history = [ChatMessage(**msg) for msg in data]
-            except (json.JSONDecodeError, IOError):
-                self.conversation_history = []
-        else:
-            self.conversation_history = []
-    
-    def save_chat_history(self):
-        """Save chat history to file."""
-        try:
-            with open(self.chat_history_file, 'w') as f:
-                json.dump([asdict(msg) for msg in self.conversation_history], f, indent=2)
-        except IOError:
-            pass  # Silently fail if can't save
+        super().load_chat_history()
+        
+        # Bounded view of the newest messages for the chat area
+        self._recent: "deque[ChatMessage]" = deque(self.conversation_history[-10:], maxlen=10)
+        
+        # Pre-formatted history table rows, parallel to conversation_history
+        self._history_rows: List[Tuple[str, str, str, str, str]] = [
+            self._history_row(msg) for msg in self.conversation_history
+        ]
+        self._chat_panel: Optional[Panel] = None
     
     def add_message(self, user_input: str, mapped_command: Optional[str] = None, 
                    execution_result: Optional[str] = None, success: bool = True, 
-                   message_type: str = "user"):
+                   message_type: str = "user") -> ChatMessage:
         """Add a message to the conversation history."""
-        message = ChatMessage(
-            timestamp=datetime.datetime.now().isoformat(),
-            user_input=user_input,
-            mapped_command=mapped_command,
-            execution_result=execution_result,
-            success=success,
-            message_type=message_type
-        )
-        self.conversation_history.append(message)
-        self.save_chat_history()
+        message = super().add_message(user_input, mapped_command, execution_result, success, message_type)
+        self._recent.append(message)
+        self._history_rows.append(self._history_row(message))
+        self._chat_panel = None
+        return message
+    
+    def reset_history(self):
+        """Drop all messages and truncate the history file."""
+        super().reset_history()
+        self._recent.clear()
+        self._history_rows = []
+        self._chat_panel = None
     
-    def create_chat_layout(self) -> Layout:
+    def create_chat_layout(self) -> "Layout":
         """Create the chat layout."""
+        from rich.layout import Layout
+        
         layout = Layout()
         
         # Split into header, chat area, and input area
@@ -113,55 +86,74 @@ class AdvancedChatbotInterface:
         
         return layout
     
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Statistics counters keyed by name."""
+        return dict(zip(_STAT_KEYS, self._counters))
+    
+    def _bump(self, index: int):
+        """Increment a statistics counter and invalidate the panels that show it."""
+        self._counters[index] += 1
+        self._header_panel = self._stats_panel = None
+    
     def render_header(self) -> Panel:
         """Render the header panel."""
+        if self._header_panel is not None:
+            return self._header_panel
+        
         header_content = f"""
 {self.bot_name}
-Platform: {self.command_mapper.system} | AI: {'✓' if self.command_mapper.use_ai else '✗'} | Commands: {self.stats['total_commands']}
+Platform: {self.command_mapper.system} | AI: {'✓' if self.command_mapper.use_ai else '✗'} | Commands: {self._counters[TOTAL_COMMANDS]}
         """
-        return Panel(header_content, border_style="blue")
+        self._header_panel = Panel(header_content, border_style="blue")
+        return self._header_panel
     
     def render_chat_area(self) -> Panel:
         """Render the chat area with recent messages."""
-        if not self.conversation_history:
-            content = "[dim]No messages yet. Start by typing a command![/dim]"
-        else:
-            # Show last 10 messages
-            recent_messages = self.conversation_history[-10:]
-            content = ""
+        if self._chat_panel is not None:
+            return self._chat_panel
+        
+        # Show last 10 messages
+        parts: List[str] = []
+        for msg in self._recent:
+            timestamp = msg.hhmm or _format_timestamp(msg.timestamp, "%H:%M")
+            
+            if msg.message_type == "user":
+                parts.append(f"[bold blue]{timestamp} You:[/bold blue] {msg.user_input}\n")
+            elif msg.message_type == "assistant":
+                parts.append(f"[bold green]{timestamp} 🤖 Assistant:[/bold green] {msg.mapped_command}\n")
+            elif msg.message_type == "error":
+                parts.append(f"[bold red]{timestamp} ❌ Error:[/bold red] {msg.user_input}\n")
             
-            for msg in recent_messages:
-                timestamp = datetime.datetime.fromisoformat(msg.timestamp).strftime("%H:%M")
-                
-                if msg.message_type == "user":
-                    content += f"[bold blue]{timestamp} You:[/bold blue] {msg.user_input}\n"
-                elif msg.message_type == "assistant":
-                    content += f"[bold green]{timestamp} 🤖 Assistant:[/bold green] {msg.mapped_command}\n"
-                elif msg.message_type == "error":
-                    content += f"[bold red]{timestamp} ❌ Error:[/bold red] {msg.user_input}\n"
-                
-                if msg.execution_result and msg.success:
-                    content += f"[dim]    Output: {msg.execution_result[:100]}{'...' if len(msg.execution_result) > 100 else ''}[/dim]\n"
-                elif msg.execution_result and not msg.success:
-                    content += f"[dim red]    Error: {msg.execution_result[:100]}{'...' if len(msg.execution_result) > 100 else ''}[/dim red]\n"
-                
-                content += "\n"
+            if msg.execution_result and msg.success:
+                parts.append(f"[dim]    Output: {_truncate(msg.execution_result, 100)}[/dim]\n")
+            elif msg.execution_result and not msg.success:
+                parts.append(f"[dim red]    Error: {_truncate(msg.execution_result, 100)}[/dim red]\n")
+            
+            parts.append("\n")
+        
+        content = "".join(parts) if parts else "[dim]No messages yet. Start by typing a command![/dim]"
         
-        return Panel(content, title="[bold]Chat History[/bold]", border_style="green")
+        self._chat_panel = Panel(content, title="[bold]Chat History[/bold]", border_style="green")
+        return self._chat_panel
     
     def render_stats(self) -> Panel:
         """Render statistics panel."""
-        success_rate = (self.stats['successful_commands'] / max(self.stats['total_commands'], 1)) * 100
+        if self._stats_panel is not None:
+            return self._stats_panel
+        
+        success_rate = (self._counters[SUCCESSFUL_COMMANDS] / max(self._counters[TOTAL_COMMANDS], 1)) * 100
         
         stats_content = f"""
-Total Commands: {self.stats['total_commands']}
-Successful: {self.stats['successful_commands']} ({success_rate:.1f}%)
-Failed: {self.stats['failed_commands']}
-AI Used: {self.stats['ai_used']}
-Fallback Used: {self.stats['fallback_used']}
+Total Commands: {self._counters[TOTAL_COMMANDS]}
+Successful: {self._counters[SUCCESSFUL_COMMANDS]} ({success_rate:.1f}%)
+Failed: {self._counters[FAILED_COMMANDS]}
+AI Used: {self._counters[AI_USED]}
+Fallback Used: {self._counters[FALLBACK_USED]}
         """
         
-        return Panel(stats_content, title="[bold]Statistics[/bold]", border_style="yellow")
+        self._stats_panel = Panel(stats_content, title="[bold]Statistics[/bold]", border_style="yellow")
+        return self._stats_panel
     
     def display_welcome(self):
         """Display welcome message."""
@@ -223,15 +215,24 @@ Fallback Used: {self.stats['fallback_used']}
         
         console.print(Panel(help_content, title="[bold]Help[/bold]", border_style="green"))
     
+    @staticmethod
+    def _history_row(msg: ChatMessage) -> Tuple[str, str, str, str, str]:
+        """Format a message as a row of the full history table."""
+        return (
+            msg.hhmmss or _format_timestamp(msg.timestamp, "%H:%M:%S"),
+            msg.message_type.capitalize(),
+            # Truncate long inputs
+            _truncate(msg.user_input, 30, 28),
+            _truncate(msg.mapped_command, 40, 38),
+            "✓" if msg.success else "✗",
+        )
+    
     def display_full_history(self, limit: int = 50):
         """Display full conversation history."""
         if not self.conversation_history:
             console.print("[yellow]No conversation history available.[/yellow]")
             return
         
-        console.print(f"\n[bold]Full Conversation History (last {min(limit, len(self.conversation_history))} messages):[/bold]")
-        console.print("=" * 100)
-        
         # Create table for history
         table = Table(show_header=True, header_style="bold magenta")
         table.add_column("Time", style="dim", width=12)
@@ -240,173 +241,70 @@ Fallback Used: {self.stats['fallback_used']}
         table.add_column("Command", style="yellow", width=40)
         table.add_column("Status", style="green", width=8)
         
-        for msg in self.conversation_history[-limit:]:
-            timestamp = datetime.datetime.fromisoformat(msg.timestamp).strftime("%H:%M:%S")
-            status = "✓" if msg.success else "✗"
-            msg_type = msg.message_type.capitalize()
-            
-            # Truncate long inputs
-            user_input = msg.user_input[:28] + "..." if len(msg.user_input) > 30 else msg.user_input
-            command = msg.mapped_command[:38] + "..." if msg.mapped_command and len(msg.mapped_command) > 40 else msg.mapped_command or ""
-            
-            table.add_row(timestamp, msg_type, user_input, command, status)
+        for row in self._history_rows[-limit:]:
+            table.add_row(*row)
         
-        console.print(table)
-        console.print()
+        # Render everything into one buffer and emit it with a single write
+        with console.capture() as capture:
+            console.print(f"\n[bold]Full Conversation History (last {min(limit, len(self.conversation_history))} messages):[/bold]")
+            console.print("=" * 100)
+            console.print(table)
+            console.print()
+        sys.stdout.write(capture.get())
+        sys.stdout.flush()
+    
+    display_history = display_full_history
     
     def display_statistics(self):
         """Display detailed statistics."""
-        if self.stats['total_commands'] == 0:
+        if self._counters[TOTAL_COMMANDS] == 0:
             console.print("[yellow]No commands executed yet.[/yellow]")
             return
         
-        success_rate = (self.stats['successful_commands'] / self.stats['total_commands']) * 100
-        ai_usage_rate = (self.stats['ai_used'] / self.stats['total_commands']) * 100
+        success_rate = (self._counters[SUCCESSFUL_COMMANDS] / self._counters[TOTAL_COMMANDS]) * 100
+        ai_usage_rate = (self._counters[AI_USED] / self._counters[TOTAL_COMMANDS]) * 100
         
         stats_content = f"""
 [bold]Command Statistics:[/bold]
 
-Total Commands Executed: {self.stats['total_commands']}
-├── Successful: {self.stats['successful_commands']} ({success_rate:.1f}%)
-├── Failed: {self.stats['failed_commands']} ({100-success_rate:.1f}%)
+Total Commands Executed: {self._counters[TOTAL_COMMANDS]}
+├── Successful: {self._counters[SUCCESSFUL_COMMANDS]} ({success_rate:.1f}%)
+├── Failed: {self._counters[FAILED_COMMANDS]} ({100-success_rate:.1f}%)
 
 AI Usage:
-├── AI Used: {self.stats['ai_used']} ({ai_usage_rate:.1f}%)
-├── Fallback Used: {self.stats['fallback_used']} ({100-ai_usage_rate:.1f}%)
+├── AI Used: {self._counters[AI_USED]} ({ai_usage_rate:.1f}%)
+├── Fallback Used: {self._counters[FALLBACK_USED]} ({100-ai_usage_rate:.1f}%)
 
 Platform: {self.command_mapper.system}
 AI Available: {'Yes' if self.command_mapper.use_ai else 'No'}
         """
         
-        console.print(Panel(stats_content, title="[bold]Statistics[/bold]", border_style="yellow"))
+        with console.capture() as capture:
+            console.print(Panel(stats_content, title="[bold]Statistics[/bold]", border_style="yellow"))
+        sys.stdout.write(capture.get())
+        sys.stdout.flush()
     
-    def process_user_input(self, user_input: str) -> bool:
-        """Process user input and return True if should continue."""
-        user_input = user_input.strip()
-        
-        if not user_input:
-            return True
-        
-        # Handle special commands
-        if user_input.lower() in ['quit', 'exit', 'q']:
-            console.print("[yellow]Goodbye! Thanks for using AI Command Assistant![/yellow]")
-            return False
-        
-        if user_input.lower() == 'help':
-            self.display_help()
-            return True
-        
-        if user_input.lower() == 'history':
-            self.display_full_history()
-            return True
-        
-        if user_input.lower() == 'stats':
-            self.display_statistics()
-            return True
-        
-        if user_input.lower() == 'clear':
-            self.conversation_history = []
-            self.save_chat_history()
-            self.stats = {"total_commands": 0, "successful_commands": 0, "failed_commands": 0, "ai_used": 0, "fallback_used": 0}
-            console.print("[green]Conversation history and statistics cleared![/green]")
-            return True
-        
-        # Process natural language command
-        try:
-            console.print(f"\n[bold]You:[/bold] {user_input}")
-            
-            # Track if AI was used
-            ai_available_before = self.command_mapper.use_ai
-            
-            # Map to command
-            with console.status("[bold green]Analyzing command..."):
-                mapped_command = self.command_mapper.map_to_command(user_input)
-            
-            # Update stats
-            self.stats['total_commands'] += 1
-            if ai_available_before and self.command_mapper.use_ai:
-                self.stats['ai_used'] += 1
-            else:
-                self.stats['fallback_used'] += 1
-            
-            if not mapped_command:
-                console.print("[red]I couldn't understand that command. Please try rephrasing or type 'help' for examples.[/red]")
-                self.add_message(user_input, message_type="error", success=False)
-                self.stats['failed_commands'] += 1
-                return True
-            
-            # Display mapped command
-            console.print(f"[bold]🤖 Assistant:[/bold] I'll execute: [yellow]{mapped_command}[/yellow]")
-            self.add_message(user_input, mapped_command, message_type="assistant")
-            
-            # Ask for confirmation
-            confirm = Prompt.ask(
-                "Execute this command?",
-                choices=["y", "n", "yes", "no"],
-                default="y"
-            )
-            
-            if confirm.lower() in ['y', 'yes']:
-                # Execute command
-                with console.status("[bold green]Executing command..."):
-                    result = self.executor.execute(mapped_command, user_input)
-                
-                # Update stats
-                if result.success:
-                    self.stats['successful_commands'] += 1
-                else:
-                    self.stats['failed_commands'] += 1
-                
-                # Display results
-                if result.success:
-                    console.print("[bold green]✓ Command executed successfully![/bold green]")
-                    if result.output:
-                        console.print(Panel(result.output, title="[bold]Output[/bold]", border_style="green"))
-                    # Update the last message with result
-                    if self.conversation_history:
-                        self.conversation_history[-1].execution_result = result.output
-                        self.conversation_history[-1].success = True
-                else:
-                    console.print(f"[bold red]✗ Command failed[/bold red]")
-                    if result.error:
-                        console.print(Panel(result.error, title="[bold]Error[/bold]", border_style="red"))
-                    # Update the last message with error
-                    if self.conversation_history:
-                        self.conversation_history[-1].execution_result = result.error
-                        self.conversation_history[-1].success = False
-            else:
-                console.print("[yellow]Command execution cancelled.[/yellow]")
-                # Update the last message
-                if self.conversation_history:
-                    self.conversation_history[-1].execution_result = "Cancelled by user"
-                    self.conversation_history[-1].success = True
-                
-        except KeyboardInterrupt:
-            console.print("\n[yellow]Operation cancelled by user.[/yellow]")
-            self.add_message(user_input, message_type="error", success=False)
-            self.stats['failed_commands'] += 1
-        except Exception as e:
-            console.print(f"[red]Error: {e}[/red]")
-            self.add_message(user_input, message_type="error", success=False)
-            self.stats['failed_commands'] += 1
-        
+    def _note_mapping(self, used_ai: bool):
+        """Count the input and whether the AI or the fallback mapped it."""
+        self._bump(TOTAL_COMMANDS)
+        self._bump(AI_USED if used_ai else FALLBACK_USED)
+    
+    def _note_outcome(self, success: bool):
+        """Count a successful or failed command."""
+        self._bump(SUCCESSFUL_COMMANDS if success else FAILED_COMMANDS)
+    
+    def _cmd_stats(self) -> bool:
+        """Handle the 'stats' command."""
+        self.display_statistics()
         return True
     
-    def run(self):
-        """Run the advanced chatbot interface."""
-        self.display_welcome()
-        
-        while True:
-            try:
-                user_input = Prompt.ask("\n[bold blue]You[/bold blue]")
-                if not self.process_user_input(user_input):
-                    break
-            except KeyboardInterrupt:
-                console.print("\n[yellow]Goodbye![/yellow]")
-                break
-            except EOFError:
-                console.print("\n[yellow]Goodbye![/yellow]")
-                break
+    def _cmd_clear(self) -> bool:
+        """Handle the 'clear' command."""
+        self.reset_history()
+        self._counters = array.array('q', [0] * len(_STAT_KEYS))
+        self._header_panel = self._stats_panel = None
+        console.print("[green]Conversation history and statistics cleared![/green]")
+        return True
 
 def main():
     """Main entry point for the advanced chatbot."""
@@ -414,7 +312,7 @@ def main():
     
     parser = argparse.ArgumentParser(description="AI Command Generator Advanced Chatbot")
     parser.add_argument("--api-key", help="OpenAI API key")
-    parser.add_argument("--model", default="gpt-3.5-turbo", help="OpenAI model to use")
+    parser.add_argument("--model", default="gpt-4o-mini", help="OpenAI model to use")
     parser.add_argument("--clear-history", action="store_true", help="Clear chat history on startup")
     
     args = parser.parse_args()
@@ -423,8 +321,7 @@ def main():
     chatbot = AdvancedChatbotInterface(api_key=args.api_key, model=args.model)
     
     if args.clear_history:
-        chatbot.conversation_history = []
-        chatbot.save_chat_history()
+        chatbot.reset_history()
         console.print("[green]Chat history cleared![/green]")
     
     # Run chatbot
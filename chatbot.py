@@ -8,8 +8,14 @@ to system commands with conversation history.
 
 import sys
 import os
+import abc
 import json
+import queue
+import logging
+import atexit
 import datetime
+import functools
+import threading
 from typing import List, Dict, Optional
 from dataclasses import dataclass, asdict
 from pathlib import Path
@@ -23,15 +29,69 @@ from rich.console import Console
 from rich.panel import Panel
 from rich.text import Text
 from rich.prompt import Prompt
-from rich.syntax import Syntax
 from rich.table import Table
-from rich.layout import Layout
-from rich.live import Live
-from rich.align import Align
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 console = Console()
+logger = logging.getLogger(__name__)
+
+@functools.lru_cache(maxsize=8)
+def _get_mapper(api_key: Optional[str], model: str) -> CommandMapper:
+    """Return the shared CommandMapper for this API key and model."""
+    return CommandMapper(api_key=api_key, model=model)
+
+@functools.lru_cache(maxsize=None)
+def _get_executor() -> CommandExecutor:
+    """Return the shared CommandExecutor."""
+    return CommandExecutor()
+
+def _dumps(obj) -> bytes:
+    """Serialize a chat history record to a newline-terminated JSON line."""
+    if orjson:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_DATACLASS) + b"\n"
+        except TypeError:
+            pass  # e.g. lone surrogates from undecodable stdin bytes, which json escapes
+    return json.dumps(obj, default=asdict).encode("utf-8") + b"\n"
+
+def _loads(data: bytes):
+    """Deserialize a JSON line written by _dumps."""
+    if orjson:
+        try:
+            return orjson.loads(data)
+        except json.JSONDecodeError:
+            pass  # orjson rejects the escaped surrogates json writes; let json decide
+    return json.loads(data)
 
-@dataclass
+@functools.lru_cache(maxsize=4096)
+def _format_timestamp(timestamp: str, fmt: str) -> str:
+    """Format an ISO timestamp; used for loaded messages without cached times."""
+    return datetime.datetime.fromisoformat(timestamp).strftime(fmt)
+
+def _truncate(text: Optional[str], limit: int, keep: Optional[int] = None) -> str:
+    """Shorten text longer than limit to its first keep (default limit) characters plus '...'."""
+    if not text:
+        return ""
+    if len(text) <= limit:
+        return text
+    return text[:limit if keep is None else keep] + "..."
+
+def _confirm(question: str) -> bool:
+    """Ask a yes/no question on one line; Enter, 'y' and 'yes' confirm."""
+    console.print(f"{question} [Y/n] ", end="")
+    answer = sys.stdin.readline()
+    if not answer:
+        raise EOFError
+    return answer.strip().lower() in ('', 'y', 'yes')
+
+# slots=True drops the per-instance __dict__; the option needs Python 3.10+
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_DATACLASS_SLOTS)
 class ChatMessage:
     """Represents a chat message."""
     timestamp: str
@@ -39,56 +99,350 @@ class ChatMessage:
     mapped_command: Optional[str]
     execution_result: Optional[str]
     success: bool
-    message_type: str  # 'user', 'system', 'error'
+    message_type: str  # 'user', 'assistant', 'system', 'error'
+    hhmm: str = ''  # Cached render times, filled in by add_message
+    hhmmss: str = ''
+    
+    # Free list of released messages, reused by acquire()
+    _pool = []
+    
+    def __post_init__(self):
+        """Intern low-cardinality fields so loaded messages share one string each."""
+        self.message_type = sys.intern(self.message_type)
+        self.hhmm = sys.intern(self.hhmm)
+    
+    @classmethod
+    def acquire(cls, **fields) -> "ChatMessage":
+        """Create a message, reusing a released instance when one is available."""
+        if cls._pool:
+            message = cls._pool.pop()
+            message.__init__(**fields)
+            return message
+        return cls(**fields)
+    
+    def release(self):
+        """Return this message to the pool; callers must drop all references to it."""
+        if len(ChatMessage._pool) < 1024:
+            ChatMessage._pool.append(self)
 
-class ChatbotInterface:
-    """Interactive chatbot interface for AI Command Generator."""
+class _HistoryWriter:
+    """Background thread writing chat history records to one file."""
+    
+    def __init__(self, path: Path):
+        self.path = path
+        self._queue: "queue.Queue" = queue.Queue()
+        # Whether the file is known to end in a complete line
+        self._tail_checked = False
+        threading.Thread(target=self._run, daemon=True).start()
+        atexit.register(self.flush)
+    
+    def put(self, mode: str, messages: List["ChatMessage"]):
+        """Queue messages to append ('ab') or to replace the file with ('wb')."""
+        self._queue.put((mode, messages))
+    
+    def flush(self):
+        """Block until all queued writes have reached disk."""
+        self._queue.join()
+    
+    def _run(self):
+        """Write queued history updates to disk, coalescing bursts into one write."""
+        while True:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            try:
+                # A rewrite supersedes everything queued before it
+                mode, chunks = 'ab', []
+                for item_mode, messages in batch:
+                    if item_mode == 'wb':
+                        mode, chunks = 'wb', []
+                    for msg in messages:
+                        try:
+                            chunks.append(_dumps(msg))
+                        except Exception as e:
+                            logger.warning("Dropping chat history record that can't be saved: %s", e)
+                
+                if mode == 'ab' and not self._tail_checked:
+                    # Terminate a line torn by a crash mid-append so the next record doesn't run on from it
+                    if self._ends_mid_line():
+                        chunks.insert(0, b"\n")
+                
+                with open(self.path, mode) as f:
+                    f.write(b"".join(chunks))
+                self._tail_checked = True
+            except Exception:
+                pass  # Silently fail if can't save
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
     
-    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-3.5-turbo"):
-        self.command_mapper = CommandMapper(api_key=api_key, model=model)
-        self.executor = CommandExecutor()
+    def _ends_mid_line(self) -> bool:
+        """Return True if the file exists and its last byte is not a newline."""
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell() == 0:
+                    return False
+                f.seek(-1, os.SEEK_END)
+                return f.read(1) != b"\n"
+        except FileNotFoundError:
+            return False
+
+# One writer thread (and exit flush) per history file, shared by every chatbot using it
+_HISTORY_WRITERS: Dict[Path, _HistoryWriter] = {}
+_HISTORY_WRITERS_LOCK = threading.Lock()
+
+def _get_history_writer(path: Path) -> _HistoryWriter:
+    """Return the shared writer for path, starting it on first use."""
+    path = path.resolve()
+    with _HISTORY_WRITERS_LOCK:
+        writer = _HISTORY_WRITERS.get(path)
+        if writer is None:
+            writer = _HISTORY_WRITERS[path] = _HistoryWriter(path)
+        return writer
+
+class _BaseChatbot(abc.ABC):
+    """Session, history and command handling shared by the chatbot interfaces."""
+    
+    # message_type recorded for executed or cancelled commands
+    _result_type = "user"
+    
+    def __init__(self, history_file: Path, api_key: Optional[str] = None, model: str = "gpt-4o-mini"):
+        self.command_mapper = _get_mapper(api_key, model)
+        self.executor = _get_executor()
+        
+        # Repeated prompts skip pattern matching; AI answers are cached by the mapper,
+        # which keeps a transient API failure from pinning a fallback result
+        self._map_cached = functools.lru_cache(maxsize=512)(self.command_mapper.map_to_command)
         self.conversation_history: List[ChatMessage] = []
-        self.chat_history_file = Path("chat_history.json")
+        
+        # History writes are flushed by a background thread off the input path
+        self._writer = _get_history_writer(history_file)
+        
+        self.chat_history_file = history_file
         self.load_chat_history()
         
         # Chatbot personality
         self.bot_name = "🤖 AI Command Assistant"
         self.welcome_message = "Hello! I'm your AI command assistant. I can help you convert natural language to system commands. Just tell me what you want to do!"
         
+        # Special chat commands; each handler returns True to keep the session going
+        self._special_commands = {
+            'quit': self._cmd_quit,
+            'exit': self._cmd_quit,
+            'q': self._cmd_quit,
+            'help': self._cmd_help,
+            'history': self._cmd_history,
+            'clear': self._cmd_clear,
+        }
+        
     def load_chat_history(self):
-        """Load chat history from file."""
-        if self.chat_history_file.exists():
+        """Load chat history from file, skipping records that can't be read back."""
+        self.conversation_history = []
+        if not self.chat_history_file.exists():
+            self._migrate_json_history()
+            return
+        
+        try:
+            data = self.chat_history_file.read_bytes()
+        except IOError:
+            return
+        
+        for line in data.splitlines():
+            if not line.strip():
+                continue
             try:
-                with open(self.chat_history_file, 'r') as f:
-                    data = json.load(f)
-                    self.conversation_history = [ChatMessage(**msg) for msg in data]
-            except (json.JSONDecodeError, IOError):
-                self.conversation_history = []
-        else:
+                self.conversation_history.append(ChatMessage(**_loads(line)))
+            except (ValueError, TypeError):
+                continue  # Torn line from a crash mid-append, or a record this version can't read
+    
+    def _migrate_json_history(self):
+        """Convert a history file from the old single-array JSON format, once."""
+        legacy_file = self.chat_history_file.with_suffix(".json")
+        if not legacy_file.exists():
+            return
+        try:
+            records = json.loads(legacy_file.read_bytes())
+            self.conversation_history = [ChatMessage(**record) for record in records]
+        except (ValueError, TypeError, IOError):
             self.conversation_history = []
+            return
+        # The old file is left in place; the new one takes over from here
+        self.save_chat_history()
     
     def save_chat_history(self):
-        """Save chat history to file."""
-        try:
-            with open(self.chat_history_file, 'w') as f:
-                json.dump([asdict(msg) for msg in self.conversation_history], f, indent=2)
-        except IOError:
-            pass  # Silently fail if can't save
+        """Rewrite the chat history file from the in-memory history."""
+        self._writer.put('wb', list(self.conversation_history))
+    
+    def _flush(self):
+        """Block until all queued history writes have reached disk."""
+        self._writer.flush()
     
     def add_message(self, user_input: str, mapped_command: Optional[str] = None, 
                    execution_result: Optional[str] = None, success: bool = True, 
-                   message_type: str = "user"):
+                   message_type: str = "user") -> ChatMessage:
         """Add a message to the conversation history."""
-        message = ChatMessage(
-            timestamp=datetime.datetime.now().isoformat(),
+        now = datetime.datetime.now()
+        message = ChatMessage.acquire(
+            timestamp=now.isoformat(),
             user_input=user_input,
             mapped_command=mapped_command,
             execution_result=execution_result,
             success=success,
-            message_type=message_type
+            message_type=message_type,
+            hhmm=now.strftime("%H:%M"),
+            hhmmss=now.strftime("%H:%M:%S")
         )
         self.conversation_history.append(message)
+        self._writer.put('ab', [message])
+        return message
+    
+    def reset_history(self):
+        """Drop all messages and truncate the history file."""
+        # Let pending writes serialize the old messages before recycling them
+        self._flush()
+        for msg in self.conversation_history:
+            msg.release()
+        self.conversation_history = []
         self.save_chat_history()
+        self._map_cached.cache_clear()
+    
+    @abc.abstractmethod
+    def display_welcome(self):
+        """Display welcome message."""
+    
+    @abc.abstractmethod
+    def display_help(self):
+        """Display detailed help information."""
+    
+    @abc.abstractmethod
+    def display_history(self, limit: int = 20):
+        """Display conversation history."""
+    
+    def _note_mapping(self, used_ai: bool):
+        """Called once an input has been mapped; subclasses may record statistics."""
+    
+    def _note_outcome(self, success: bool):
+        """Called once an input has failed or run; subclasses may record statistics."""
+    
+    def _cmd_quit(self) -> bool:
+        """Say goodbye and end the session."""
+        console.print("[yellow]Goodbye! Thanks for using AI Command Assistant![/yellow]")
+        return False
+    
+    def _cmd_help(self) -> bool:
+        """Handle the 'help' command."""
+        self.display_help()
+        return True
+    
+    def _cmd_history(self) -> bool:
+        """Handle the 'history' command."""
+        self.display_history()
+        return True
+    
+    def _cmd_clear(self) -> bool:
+        """Handle the 'clear' command."""
+        self.reset_history()
+        console.print("[green]Conversation history cleared![/green]")
+        return True
+    
+    def process_user_input(self, user_input: str) -> bool:
+        """Process user input and return True if should continue."""
+        user_input = user_input.strip()
+        
+        if not user_input:
+            return True
+        
+        # Handle special commands
+        handler = self._special_commands.get(user_input.lower())
+        if handler:
+            return handler()
+        
+        # Process natural language command
+        try:
+            console.print(f"\n[bold]You:[/bold] {user_input}")
+            
+            # Track if AI was used
+            ai_available_before = self.command_mapper.use_ai
+            
+            # Map to command
+            with console.status("[bold green]Analyzing command..."):
+                if ai_available_before:
+                    mapped_command = self.command_mapper.map_to_command(user_input)
+                else:
+                    # Keyed on the normalized input, as map_to_command lowercases and strips anyway
+                    mapped_command = self._map_cached(user_input.strip().lower())
+            
+            self._note_mapping(ai_available_before and self.command_mapper.use_ai)
+            
+            if not mapped_command:
+                console.print("[red]I couldn't understand that command. Please try rephrasing or type 'help' for examples.[/red]")
+                self.add_message(user_input, message_type="error", success=False)
+                self._note_outcome(False)
+                return True
+            
+            # Display mapped command
+            console.print(f"[bold]🤖 Assistant:[/bold] I'll execute: [yellow]{mapped_command}[/yellow]")
+            
+            # Ask for confirmation
+            if _confirm("Execute this command?"):
+                # Execute command
+                with console.status("[bold green]Executing command..."):
+                    result = self.executor.execute(mapped_command, user_input)
+                
+                self._note_outcome(result.success)
+                
+                # Display results
+                if result.success:
+                    console.print("[bold green]✓ Command executed successfully![/bold green]")
+                    if result.output:
+                        console.print(Panel(result.output, title="[bold]Output[/bold]", border_style="green"))
+                    self.add_message(user_input, mapped_command, result.output, True, message_type=self._result_type)
+                else:
+                    console.print(f"[bold red]✗ Command failed[/bold red]")
+                    if result.error:
+                        console.print(Panel(result.error, title="[bold]Error[/bold]", border_style="red"))
+                    self.add_message(user_input, mapped_command, result.error, False, message_type=self._result_type)
+            else:
+                console.print("[yellow]Command execution cancelled.[/yellow]")
+                self.add_message(user_input, mapped_command, "Cancelled by user", True, message_type=self._result_type)
+                
+        except KeyboardInterrupt:
+            console.print("\n[yellow]Operation cancelled by user.[/yellow]")
+            self.add_message(user_input, message_type="error", success=False)
+            self._note_outcome(False)
+        except Exception as e:
+            console.print(f"[red]Error: {e}[/red]")
+            self.add_message(user_input, message_type="error", success=False)
+            self._note_outcome(False)
+        
+        return True
+    
+    def run(self):
+        """Run the chatbot interface."""
+        self.display_welcome()
+        
+        while True:
+            try:
+                user_input = Prompt.ask("\n[bold blue]You[/bold blue]")
+                if not self.process_user_input(user_input):
+                    break
+            except KeyboardInterrupt:
+                console.print("\n[yellow]Goodbye![/yellow]")
+                break
+            except EOFError:
+                console.print("\n[yellow]Goodbye![/yellow]")
+                break
+
+class ChatbotInterface(_BaseChatbot):
+    """Interactive chatbot interface for AI Command Generator."""
+    
+    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4o-mini"):
+        super().__init__(Path("chat_history.jsonl"), api_key=api_key, model=model)
     
     def display_welcome(self):
         """Display welcome message and system info."""
@@ -170,112 +524,18 @@ class ChatbotInterface:
         table.add_column("Status", style="green", width=8)
         
         for msg in self.conversation_history[-limit:]:
-            timestamp = datetime.datetime.fromisoformat(msg.timestamp).strftime("%H:%M:%S")
+            timestamp = msg.hhmmss or _format_timestamp(msg.timestamp, "%H:%M:%S")
             status = "✓" if msg.success else "✗"
             msg_type = msg.message_type.capitalize()
             
             # Truncate long inputs
-            user_input = msg.user_input[:50] + "..." if len(msg.user_input) > 50 else msg.user_input
-            command = msg.mapped_command[:40] + "..." if msg.mapped_command and len(msg.mapped_command) > 40 else msg.mapped_command or ""
+            user_input = _truncate(msg.user_input, 50)
+            command = _truncate(msg.mapped_command, 40)
             
             table.add_row(timestamp, msg_type, user_input, command, status)
         
         console.print(table)
         console.print()
-    
-    def process_user_input(self, user_input: str) -> bool:
-        """Process user input and return True if should continue."""
-        user_input = user_input.strip()
-        
-        if not user_input:
-            return True
-        
-        # Handle special commands
-        if user_input.lower() in ['quit', 'exit', 'q']:
-            console.print("[yellow]Goodbye! Thanks for using AI Command Assistant![/yellow]")
-            return False
-        
-        if user_input.lower() == 'help':
-            self.display_help()
-            return True
-        
-        if user_input.lower() == 'history':
-            self.display_history()
-            return True
-        
-        if user_input.lower() == 'clear':
-            self.conversation_history = []
-            self.save_chat_history()
-            console.print("[green]Conversation history cleared![/green]")
-            return True
-        
-        # Process natural language command
-        try:
-            console.print(f"\n[bold]You:[/bold] {user_input}")
-            
-            # Map to command
-            with console.status("[bold green]Analyzing command..."):
-                mapped_command = self.command_mapper.map_to_command(user_input)
-            
-            if not mapped_command:
-                console.print("[red]I couldn't understand that command. Please try rephrasing or type 'help' for examples.[/red]")
-                self.add_message(user_input, message_type="error", success=False)
-                return True
-            
-            # Display mapped command
-            console.print(f"[bold]🤖 Assistant:[/bold] I'll execute: [yellow]{mapped_command}[/yellow]")
-            
-            # Ask for confirmation
-            confirm = Prompt.ask(
-                "Execute this command?",
-                choices=["y", "n", "yes", "no"],
-                default="y"
-            )
-            
-            if confirm.lower() in ['y', 'yes']:
-                # Execute command
-                with console.status("[bold green]Executing command..."):
-                    result = self.executor.execute(mapped_command, user_input)
-                
-                # Display results
-                if result.success:
-                    console.print("[bold green]✓ Command executed successfully![/bold green]")
-                    if result.output:
-                        console.print(Panel(result.output, title="[bold]Output[/bold]", border_style="green"))
-                    self.add_message(user_input, mapped_command, result.output, True)
-                else:
-                    console.print(f"[bold red]✗ Command failed[/bold red]")
-                    if result.error:
-                        console.print(Panel(result.error, title="[bold]Error[/bold]", border_style="red"))
-                    self.add_message(user_input, mapped_command, result.error, False)
-            else:
-                console.print("[yellow]Command execution cancelled.[/yellow]")
-                self.add_message(user_input, mapped_command, "Cancelled by user", True)
-                
-        except KeyboardInterrupt:
-            console.print("\n[yellow]Operation cancelled by user.[/yellow]")
-            self.add_message(user_input, message_type="error", success=False)
-        except Exception as e:
-            console.print(f"[red]Error: {e}[/red]")
-            self.add_message(user_input, message_type="error", success=False)
-        
-        return True
-    
-    def run(self):
-        """Run the chatbot interface."""
-        self.display_welcome()
-        
-        while True:
-            try:
-                user_input = Prompt.ask("\n[bold blue]You[/bold blue]")
-                if not self.process_user_input(user_input):
-                    break
-            except KeyboardInterrupt:
-                console.print("\n[yellow]Goodbye![/yellow]")
-                break
-            except EOFError:
-                console.print("\n[yellow]Goodbye![/yellow]")
-                break
 
 def main():
     """Main entry point for the chatbot."""
@@ -283,7 +543,7 @@ def main():
     
     parser = argparse.ArgumentParser(description="AI Command Generator Chatbot")
     parser.add_argument("--api-key", help="OpenAI API key")
-    parser.add_argument("--model", default="gpt-3.5-turbo", help="OpenAI model to use")
+    parser.add_argument("--model", default="gpt-4o-mini", help="OpenAI model to use")
     parser.add_argument("--clear-history", action="store_true", help="Clear chat history on startup")
     parser.add_argument("--input", "-i", help="Direct input command (non-interactive mode)")
     
@@ -293,8 +553,7 @@ def main():
     chatbot = ChatbotInterface(api_key=args.api_key, model=args.model)
     
     if args.clear_history:
-        chatbot.conversation_history = []
-        chatbot.save_chat_history()
+        chatbot.reset_history()
         console.print("[green]Chat history cleared![/green]")
     
     # Handle direct input or interactive mode
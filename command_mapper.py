@@ -7,16 +7,602 @@ and fallback pattern matching.
 
 import os
 import re
+import sys
 import platform
 import json
+import asyncio
+import logging
+import hashlib
+import functools
+import threading
+import importlib.util
+from collections import OrderedDict
 from typing import Optional, Dict, List, Tuple
 from dataclasses import dataclass
-from difflib import get_close_matches
+from urllib.parse import quote, quote_plus
+from difflib import SequenceMatcher
+
+logger = logging.getLogger(__name__)
+
+# functools.cached_property needs Python 3.8+; older versions recompute on each access
+cached_property = getattr(functools, "cached_property", property)
+
+# openai drags in httpx and pydantic, so only probe for it here and import it
+# on the first request that actually reaches the API
+_HAS_OPENAI = importlib.util.find_spec("openai") is not None
 
 try:
-    import openai
+    import diskcache
+except ImportError:
+    diskcache = None
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import re._parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+# RE2 matches in linear time, so "a.*b.*c" style patterns can't blow up on long inputs
+try:
+    import re2 as re_engine
 except ImportError:
-    openai = None
+    re_engine = re
+
+try:
+    from rapidfuzz import fuzz, process as fuzz_process
+except ImportError:
+    fuzz = fuzz_process = None
+
+# Known command keywords and their variations, used for spell correction
+_COMMAND_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    # Redis commands
+    "redis": ("redis", "reddis", "reds"),
+    "sentinel": ("sentinel", "snetinel", "sental", "snetal", "snatel"),
+    "server": ("server", "srever", "srvr"),
+    "start": ("start", "sttart", "sart", "satrt"),
+    "stop": ("stop", "sttop", "stp"),
+    "restart": ("restart", "resttart", "restrt"),
+    
+    # Common system commands
+    "check": ("check", "chek", "chck"),
+    "status": ("status", "sttus", "staus"),
+    "memory": ("memory", "memry", "memmory"),
+    "ram": ("ram", "rm"),
+    "cpu": ("cpu", "cuppu"),
+    "disk": ("disk", "dsk"),
+    "network": ("network", "netwrok", "netwrk"),
+    "wifi": ("wifi", "wifi", "wifi"),
+    "port": ("port", "prt"),
+    "process": ("process", "proces", "prcess"),
+    "file": ("file", "fil"),
+    "folder": ("folder", "flder", "foler"),
+    "copy": ("copy", "cpy", "coppy"),
+    "move": ("move", "mov", "mve"),
+    "delete": ("delete", "delte", "dlete"),
+    "rename": ("rename", "renme", "renam"),
+    "create": ("create", "creat", "crate"),
+    "open": ("open", "opn", "ope"),
+    "search": ("search", "serch", "seach"),
+    "google": ("google", "googl", "gogle"),
+    "youtube": ("youtube", "youtub", "yutube"),
+    "gmail": ("gmail", "gmal", "gmil"),
+    "facebook": ("facebook", "facebok", "fcebook"),
+    "twitter": ("twitter", "twtter", "twiter"),
+    "instagram": ("instagram", "instgram", "instagrm"),
+    "spotify": ("spotify", "spotfy", "spotif"),
+    "reddit": ("reddit", "redit", "redd"),
+    "whatsapp": ("whatsapp", "whatsap", "whatspp"),
+    "shutdown": ("shutdown", "shutdwn", "shutdn"),
+    "restart": ("restart", "resttart", "restrt"),
+    "clear": ("clear", "clr", "cler"),
+    "system": ("system", "systm", "sysem"),
+    "info": ("info", "inf", "infor"),
+    "usage": ("usage", "usge", "usag"),
+    "connect": ("connect", "conect", "connct"),
+    "disconnect": ("disconnect", "disconect", "disconnct"),
+    "list": ("list", "lst", "lits"),
+    "available": ("available", "availble", "availabl"),
+    "networks": ("networks", "netwrks", "netwks"),
+    "calculator": ("calculator", "calc", "calcltr"),
+    "notepad": ("notepad", "notepd", "notepd"),
+    "chrome": ("chrome", "chrm", "chome"),
+    "firefox": ("firefox", "firef", "firefx"),
+    "safari": ("safari", "safri", "safr"),
+    "vscode": ("vscode", "vscd", "vsc"),
+    "weather": ("weather", "wether", "weathr"),
+    "time": ("time", "tim", "tme"),
+    "date": ("date", "dat", "dte"),
+}
+
+# Exact variation -> keyword lookup; like the fuzzy match, only words of 3+
+# characters are corrected and the first keyword listing a variation wins
+_VARIATION_TO_KEYWORD: Dict[str, str] = {}
+for _keyword, _variations in _COMMAND_KEYWORDS.items():
+    for _variation in (_keyword,) + _variations:
+        if len(_variation) >= 3:
+            _VARIATION_TO_KEYWORD.setdefault(_variation, _keyword)
+del _keyword, _variations, _variation
+_VARIATIONS = tuple(_VARIATION_TO_KEYWORD)
+
+# Identical across platforms and calls, so it forms a stable prefix that the
+# API's prompt caching can reuse; platform-specific text goes after it
+_SYSTEM_PROMPT_PREFIX = """
+You are a command line assistant that converts natural language to system commands.
+
+Rules:
+1. Return ONLY the command, no explanations
+2. Use platform-appropriate commands
+3. For macOS, use 'open -a' for applications
+4. For Windows, use 'start' for applications
+5. For Linux, use direct command names
+6. For web searches, return a command that opens the browser
+7. Be safe - avoid dangerous commands like 'rm -rf /'
+
+Examples:
+- "list ports with 8085" → lsof -i tcp:8085
+- "kill port 8085" → kill -9 $(lsof -t -i tcp:8085)
+- "search for weather" → open "https://www.google.com/search?q=weather"
+- "show date" → date
+- "check wifi" → networksetup -getinfo Wi-Fi (macOS) or ipconfig (Windows) or iwconfig (Linux)
+"""
+
+# Persistent AI response cache, shared by all processes of this user
+_DISK_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "ai-command-mapper")
+
+@functools.lru_cache(maxsize=None)
+def _disk_cache():
+    """Open the on-disk AI response cache, or return None if it is unavailable."""
+    if not diskcache:
+        return None
+    try:
+        return diskcache.Cache(_DISK_CACHE_DIR)
+    except OSError:
+        return None
+
+class _CompletionCache:
+    """LRU of AI completions in memory, backed by the on-disk cache when available."""
+    
+    def __init__(self, maxsize: int = 4096):
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._maxsize = maxsize
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def key(model: str, system_prompt: str, user_prompt: str) -> str:
+        """Cache key for one request."""
+        return hashlib.sha256("\0".join((model, system_prompt, user_prompt)).encode("utf-8")).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached completion for key, or None."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        
+        disk = _disk_cache()
+        value = disk.get(key) if disk is not None else None
+        if value is not None:
+            self._remember(key, value)
+        return value
+    
+    def put(self, key: str, value: str):
+        """Store a completion in memory and on disk."""
+        self._remember(key, value)
+        disk = _disk_cache()
+        if disk is not None:
+            disk.set(key, value)
+    
+    def _remember(self, key: str, value: str):
+        """Add an entry to the in-memory LRU, evicting the oldest if full."""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+_AI_CACHE = _CompletionCache()
+
+# A command is one short line, so generation stops at the first newline.
+# Interactive callers could stream and cut at the first token boundary to get
+# closer to time-to-first-token; batch and cached use don't need it.
+_COMPLETION_OPTIONS = {"max_tokens": 32, "stop": ["\n"], "temperature": 0.1}
+
+def _completion_messages(system_prompt: str, user_prompt: str) -> List[Dict[str, str]]:
+    """Chat messages for one command request."""
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt}
+    ]
+
+# Interactive callers shouldn't wait minutes on a stalled request
+_AI_TIMEOUT = 10.0
+_AI_POOL_LIMITS = {"max_keepalive_connections": 20, "max_connections": 50}
+
+@functools.lru_cache(maxsize=None)
+def _openai_client(api_key: str):
+    """OpenAI client for api_key, importing openai on first use; one keep-alive pool per key for the process."""
+    import openai
+    try:
+        import httpx
+    except ImportError:
+        return openai.OpenAI(api_key=api_key, timeout=_AI_TIMEOUT)
+    
+    http_client = httpx.Client(limits=httpx.Limits(**_AI_POOL_LIMITS), timeout=_AI_TIMEOUT)
+    return openai.OpenAI(api_key=api_key, http_client=http_client, timeout=_AI_TIMEOUT)
+
+def _async_openai_client(api_key: str):
+    """AsyncOpenAI client for api_key with its own keep-alive pool, bound to the event loop that uses it."""
+    import openai
+    try:
+        import httpx
+    except ImportError:
+        return openai.AsyncOpenAI(api_key=api_key, timeout=_AI_TIMEOUT)
+    
+    http_client = httpx.AsyncClient(limits=httpx.Limits(**_AI_POOL_LIMITS), timeout=_AI_TIMEOUT)
+    return openai.AsyncOpenAI(api_key=api_key, http_client=http_client, timeout=_AI_TIMEOUT)
+
+def _ai_completion(api_key: str, model: str, system_prompt: str, user_prompt: str) -> str:
+    """Ask the chat model to answer user_prompt; answers are cached in memory and on disk."""
+    key = _AI_CACHE.key(model, system_prompt, user_prompt)
+    command = _AI_CACHE.get(key)
+    if command is None:
+        response = _openai_client(api_key).chat.completions.create(
+            model=model,
+            messages=_completion_messages(system_prompt, user_prompt),
+            **_COMPLETION_OPTIONS
+        )
+        command = response.choices[0].message.content.strip()
+        _AI_CACHE.put(key, command)
+    return command
+
+async def _ai_completion_async(client, model: str, system_prompt: str, user_prompt: str) -> str:
+    """Async variant of _ai_completion using an AsyncOpenAI client; cache hits never await."""
+    key = _AI_CACHE.key(model, system_prompt, user_prompt)
+    command = _AI_CACHE.get(key)
+    if command is None:
+        response = await client.chat.completions.create(
+            model=model,
+            messages=_completion_messages(system_prompt, user_prompt),
+            **_COMPLETION_OPTIONS
+        )
+        command = response.choices[0].message.content.strip()
+        _AI_CACHE.put(key, command)
+    return command
+
+# Common app launch commands per platform
+APP_MAPPINGS = {
+    "chrome": {
+        "darwin": 'open -a "Google Chrome"',
+        "windows": "start chrome",
+        "linux": "google-chrome"
+    },
+    "firefox": {
+        "darwin": 'open -a "Firefox"',
+        "windows": "start firefox",
+        "linux": "firefox"
+    },
+    "vscode": {
+        "darwin": 'open -a "Visual Studio Code"',
+        "windows": "code",
+        "linux": "code"
+    },
+    "safari": {
+        "darwin": 'open -a "Safari"',
+        "windows": "start safari",
+        "linux": "safari"
+    }
+}
+
+def _required_literal(pattern: str) -> str:
+    """Longest run of literal characters that every match of pattern must contain."""
+    runs = [""]
+    for op, av in sre_parse.parse(pattern):
+        if op is sre_parse.LITERAL:
+            runs[-1] += chr(av)
+        else:
+            runs.append("")
+    return max(runs, key=len)
+
+_PHRASE_SEPARATOR = re.compile(r"\\s\+|\.\*")
+
+def _keyword_phrase(pattern: str) -> Optional[str]:
+    """Input spelling out a pattern of plain words joined by \\s+ or .*, or None for other patterns."""
+    words = _PHRASE_SEPARATOR.split(pattern)
+    if all(word.isalnum() for word in words):
+        return " ".join(words)
+    return None
+
+def _template(command: str):
+    """Handler filling command's {} fields from a regex match's capture groups."""
+    return lambda m: command.format(*m.groups())
+
+# Commands the AI must never be allowed to suggest, fused so a command is scanned once.
+# The patterns are lower-case and matched against the lower-cased command.
+_DANGEROUS_RE = re_engine.compile("|".join(f"(?:{pattern})" for pattern in (
+    r"rm\s+-rf\s+/",
+    r"dd\s+if=/dev/zero",
+    r":\(\)\{\s*:\|:\s*&\s*\};:",
+    r"mkfs\.",
+    r"fdisk",
+    r"parted",
+    r"sudo\s+rm\s+-rf",
+    r"sudo\s+dd",
+    r"sudo\s+mkfs",
+    r"sudo\s+fdisk",
+    r"sudo\s+parted"
+)))
+
+# How each platform opens a URL in the default browser
+_URL_OPENERS = {"darwin": "open", "windows": "start", "linux": "xdg-open"}
+
+def _web_mapping(url) -> Dict[str, str]:
+    """Per-platform commands opening url, a string or a function of the regex match."""
+    if callable(url):
+        return {system: (lambda m, opener=opener: f"{opener} {url(m)}")
+                for system, opener in _URL_OPENERS.items()}
+    return {system: f"{opener} {url}" for system, opener in _URL_OPENERS.items()}
+
+# Sites opened directly by "open/launch/go to/check/play <site>"
+WEB_TARGETS = {
+    "youtube": "https://www.youtube.com",
+    "gmail": "https://mail.google.com",
+    "facebook": "https://www.facebook.com",
+    "instagram": "https://www.instagram.com",
+    "twitter": "https://twitter.com",
+    "spotify": "https://open.spotify.com",
+    "reddit": "https://www.reddit.com",
+    "whatsapp web": "https://web.whatsapp.com",
+}
+_WEB_TARGET_VERBS = r"(open|launch|go\s+to|check|play)"
+_WEB_TARGET_PATTERN = _WEB_TARGET_VERBS + r"\s+(" + "|".join(
+    name.replace(" ", r"\s+") for name in WEB_TARGETS
+) + ")"
+
+# Help categories of the fallback patterns, keyed by the exact pattern string
+_CATEGORY_PATTERNS = {
+    "System Information": [
+        r"check\s+system\s+info",
+        r"check\s+cpu\s+usage",
+        r"check\s+(memory|ram)\s+(usage|status)",
+        r"disk.*space",
+        r"memory.*usage",
+        r"cpu.*usage"
+    ],
+    "File Operations": [
+        r"copy\s+file",
+        r"move\s+file",
+        r"rename",
+        r"(create|make).*folder",
+        r"(remove|delete)\s+folder",
+        r"list.*files",
+        r"show.*files",
+        r"current.*directory",
+        r"where.*am.*i"
+    ],
+    "Network & WiFi": [
+        r"connect.*wifi",
+        r"disconnect.*wifi",
+        r"list.*available.*wifi",
+        r"check.*wifi",
+        r"wifi.*status",
+        r"network.*status"
+    ],
+    "Applications": [
+        r"open.*chrome",
+        r"open.*firefox",
+        r"open.*vscode",
+        r"open.*safari",
+        r"start\s+notepad",
+        r"open\s+calculator"
+    ],
+    "Web Services": [
+        r"(open|launch|go\s+to)\s+youtube",
+        r"search\s+youtube",
+        r"(open|launch|check)\s+gmail",
+        r"(open|launch|go\s+to)\s+facebook",
+        r"(open|launch|go\s+to)\s+instagram",
+        r"(open|launch|go\s+to)\s+twitter",
+        r"(tweet|send\s+a\s+tweet)",
+        r"(open|launch|play)\s+spotify",
+        r"search\s+spotify",
+        r"(open|launch|go\s+to)\s+reddit",
+        r"search\s+reddit",
+        r"(open|launch)\s+whatsapp\s+web",
+        r"search.*weather",
+        r"search.*for",
+        r"google"
+    ],
+    "Redis Operations": [
+        r"start\s+redis\s+sentinel",
+        r"start\s+redis\s+server",
+        r"stop\s+redis",
+        r"restart\s+redis",
+        r"check\s+redis\s+status",
+        r"check\s+redis\s+sentinel\s+status"
+    ],
+    "Zookeeper Operations": [
+        r"start.*zookeeper"
+    ],
+    "Kafka Operations": [
+        r"start.*kafka",
+        r"list.*kafka.*topics",
+        r"show.*kafka.*topics",
+        r"delete.*kafka.*topic",
+        r"delete.*topic"
+    ],
+    "Process Management": [
+        r"list.*processes",
+        r"show.*processes",
+        r"kill.*process"
+    ],
+    "System Control": [
+        r"shutdown.*computer",
+        r"restart.*computer",
+        r"sleep.*computer",
+        r"clear\s+the\s+screen"
+    ],
+    "Date & Time": [
+        r"show.*date",
+        r"show.*me.*date",
+        r"show.*today.*date",
+        r"what.*date",
+        r"current.*time",
+        r"what.*time",
+        r"display.*date",
+        r"display.*time",
+        r"today.*date",
+        r"check\s+date\s+and\s+time"
+    ],
+    "Port Operations": [
+        r"list.*port",
+        r"kill.*port",
+        r"find.*port"
+    ]
+}
+
+# Pattern -> category; a pattern listed twice stays in the first category
+_PATTERN_CATEGORY: Dict[str, str] = {}
+for _category, _patterns in _CATEGORY_PATTERNS.items():
+    for _pattern in _patterns:
+        _PATTERN_CATEGORY.setdefault(_pattern, _category)
+del _category, _patterns, _pattern
+
+# Regex fragments and how they read in help descriptions
+_DESCRIPTION_TOKENS = {
+    r"\s+": " ",
+    r"\d+": "NUMBER",
+    r"\S+": "FILENAME",
+    r"\w+": "WORD",
+    r"(\d{4,5})": "PORT",
+    r"([a-zA-Z\s]+)": "TEXT",
+    r"(.+)": "TEXT",
+    ".*": " ",
+    "_": " ",
+    "-": " ",
+}
+_DESCRIPTION_RE = re.compile("|".join(map(re.escape, _DESCRIPTION_TOKENS)))
+
+# Example input shown in the help for each fallback pattern
+_PATTERN_EXAMPLES = {
+    # Port Operations
+    r"list.*port.*(\d{4,5})": "list all ports with 8085",
+    r"kill.*port.*(\d{4,5})": "kill port 8085",
+    r"find.*port.*(\d{4,5})": "find port 8085",
+    
+    # System Information
+    r"check\s+cpu\s+usage": "check cpu usage",
+    r"check\s+(memory|ram)\s+(usage|status)": "check RAM status",
+    r"check\s+(memory|ram)\s+usage": "check RAM usage",
+    r"check\s+(memory|ram)\s+status": "check RAM status",
+    r"check\s+system\s+info": "check system info",
+    r"disk.*space": "check disk space",
+    r"memory.*usage": "check memory usage",
+    r"cpu.*usage": "check cpu usage",
+    
+    # File Operations
+    r"copy\s+file\s+(\S+)\s+to\s+(\S+)": "copy file source.txt to destination.txt",
+    r"move\s+file\s+(\S+)\s+to\s+(\S+)": "move file source.txt to destination.txt",
+    r"rename\s+(\S+)\s+to\s+(\S+)": "rename oldname.txt to newname.txt",
+    r"(create|make)\s+(a\s+)?(new\s+)?folder\s+called\s+(\S+)": "create folder my_folder",
+    r"(remove|delete)\s+folder\s+(\S+)": "delete folder my_folder",
+    r"list.*files": "list files in current directory",
+    r"show.*files": "show files in current directory",
+    r"current.*directory": "show current directory",
+    r"where.*am.*i": "where am i",
+    
+    # Applications
+    r"open.*chrome": "open chrome",
+    r"open.*firefox": "open firefox",
+    r"open.*vscode": "open vscode",
+    r"open.*safari": "open safari",
+    r"start\s+notepad": "start notepad",
+    r"open\s+calculator": "open calculator",
+    
+    # Network & WiFi
+    r"connect.*wifi.*(\S+)": "connect to wifi MyNetwork",
+    r"connect\s+(to\s+)?wifi\s+(\S+)": "connect to wifi MyNetwork",
+    r"disconnect\s+(from\s+)?wifi": "disconnect from wifi",
+    r"list\s+available\s+wifi\s+networks": "list available wifi networks",
+    r"check.*wifi": "check wifi status",
+    r"wifi.*status": "check wifi status",
+    r"network.*status": "check network status",
+    
+    # Web Services
+    r"(open|launch|go\s+to)\s+youtube": "open youtube",
+    r"search\s+youtube\s+for\s+(.+)": "search youtube for music",
+    r"(open|launch|check)\s+gmail": "open gmail",
+    r"(open|launch|go\s+to)\s+facebook": "open facebook",
+    r"(open|launch|go\s+to)\s+instagram": "open instagram",
+    r"(open|launch|go\s+to)\s+twitter": "open twitter",
+    r"(tweet|send\s+a\s+tweet)\s+['](.+)[']": "tweet 'Hello world!'",
+    r"(open|launch|play)\s+spotify": "open spotify",
+    r"search\s+spotify\s+for\s+(.+)": "search spotify for songs",
+    r"(open|launch|go\s+to)\s+reddit": "open reddit",
+    r"search\s+reddit\s+for\s+(.+)": "search reddit for programming",
+    r"(open|launch)\s+whatsapp\s+web": "open whatsapp web",
+    r"search.*weather.*in\s+([a-zA-Z\s]+)": "search for weather in London",
+    r"search.*for\s+([a-zA-Z\s]+)": "search for python tutorial",
+    r"google\s+([a-zA-Z\s]+)": "google machine learning",
+    
+    # Redis Operations
+    r"start\s+redis\s+sentinel": "start redis sentinel",
+    r"start\s+redis\s+server": "start redis server",
+    r"stop\s+redis": "stop redis",
+    r"restart\s+redis": "restart redis",
+    r"check\s+redis\s+status": "check redis status",
+    r"check\s+redis\s+sentinel\s+status": "check redis sentinel status",
+    
+    # Zookeeper Operations
+    r"start.*zookeeper": "start zookeeper",
+    
+    # Kafka Operations
+    r"start.*kafka": "start kafka",
+    r"list.*kafka.*topics": "list kafka topics",
+    r"show.*kafka.*topics": "show kafka topics",
+    r"delete.*kafka.*topic.*(\S+)": "delete kafka topic my_topic",
+    r"delete.*topic.*(\S+)": "delete topic my_topic",
+    
+    # Process Management
+    r"list.*processes": "list processes",
+    r"show.*processes": "show processes",
+    r"kill.*process.*(\d+)": "kill process 1234",
+    
+    # System Control
+    r"shutdown.*computer": "shutdown my computer",
+    r"shutdown\s+(my\s+)?computer": "shutdown my computer",
+    r"restart.*computer": "restart my computer",
+    r"restart\s+(my\s+)?(pc|computer)": "restart my computer",
+    r"clear\s+the\s+screen": "clear the screen",
+    r"sleep.*computer": "sleep computer",
+    
+    # Date & Time
+    r"show.*date": "show me today's date",
+    r"show.*me.*date": "show me today's date",
+    r"show.*today.*date": "show today's date",
+    r"what.*date": "what date is it",
+    r"current.*time": "what time is it",
+    r"what.*time": "what time is it",
+    r"display.*date": "display current date",
+    r"display.*time": "display current time",
+    r"today.*date": "show today's date",
+    r"check\s+date\s+and\s+time": "check date and time",
+    
+    # Command Listing
+    r"list.*all.*commands": "list all commands",
+    r"show.*all.*commands": "show all commands",
+    r"help.*commands": "help commands",
+    r"list.*redis.*commands": "list redis commands",
+    r"show.*redis.*commands": "show redis commands"
+}
 
 @dataclass
 class CommandMapping:
@@ -29,44 +615,55 @@ class CommandMapping:
 class CommandMapper:
     """Maps natural language to system commands using AI and fallback rules."""
     
-    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-3.5-turbo"):
+    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4o-mini"):
         self.model = model
         self.system = platform.system().lower()
         
         # Initialize OpenAI if available
-        if openai and (api_key or os.getenv("OPENAI_API_KEY")):
-            openai.api_key = api_key or os.getenv("OPENAI_API_KEY")
+        self._api_key = api_key or os.getenv("OPENAI_API_KEY")
+        if _HAS_OPENAI and self._api_key:
             self.use_ai = True
         else:
             self.use_ai = False
-            print("Warning: OpenAI not available. Using fallback pattern matching only.")
+            logger.warning("OpenAI not available. Using fallback pattern matching only.")
+        
+        # The model already tolerates typos, so spell correction only backs up the fallback rules
+        self._use_correction = not self.use_ai
         
         # Load fallback patterns
         self.fallback_patterns = self._load_fallback_patterns()
         
-        # Common app mappings
-        self.app_mappings = {
-            "chrome": {
-                "darwin": 'open -a "Google Chrome"',
-                "windows": "start chrome",
-                "linux": "google-chrome"
-            },
-            "firefox": {
-                "darwin": 'open -a "Firefox"',
-                "windows": "start firefox",
-                "linux": "firefox"
-            },
-            "vscode": {
-                "darwin": 'open -a "Visual Studio Code"',
-                "windows": "code",
-                "linux": "code"
-            },
-            "safari": {
-                "darwin": 'open -a "Safari"',
-                "windows": "start safari",
-                "linux": "safari"
-            }
+        # Patterns with a command on this platform, compiled once and kept in priority order.
+        # Inputs are lower-cased before matching, so no case-insensitive flag is needed.
+        self._compiled_patterns = tuple(
+            (re_engine.compile(pattern), command)
+            for pattern, mapping in self.fallback_patterns.items()
+            for command in [mapping.get(self.system, mapping.get("all"))]
+            if command
+        )
+        
+        # With hyperscan all patterns are matched in a single pass over the input
+        self._pattern_db = self._compile_pattern_db()
+        self._pattern_db_lock = threading.Lock()
+        
+        # Otherwise one Aho-Corasick pass over the input picks the patterns worth running
+        self._literal_filter = self._build_literal_filter() if self._pattern_db is None else None
+        
+        # Inputs spelling out a keyword-only pattern ("check cpu usage") are resolved up front,
+        # through the regular scan so pattern priority still decides, and then cost one lookup
+        self._phrase_commands: Dict[str, str] = {}
+        self._phrase_commands = {
+            phrase: self._fallback_map_command(phrase)
+            for phrase in map(_keyword_phrase, (pattern.pattern for pattern, _ in self._compiled_patterns))
+            if phrase
         }
+        
+        # App launch commands for this platform only
+        self.apps = {name: variants[self.system] for name, variants in APP_MAPPINGS.items()
+                     if self.system in variants}
+        
+        # Built once; identical on every request so the API can cache it
+        self._system_prompt = self._build_system_prompt()
     
     def map_to_command(self, user_input: str) -> Optional[str]:
         """
@@ -78,7 +675,7 @@ class CommandMapper:
         Returns:
             System command string or None if mapping failed
         """
-        user_input = user_input.strip().lower()
+        user_input = sys.intern(user_input.strip().lower())
         
         # Try AI mapping first
         if self.use_ai:
@@ -93,6 +690,67 @@ class CommandMapper:
         
         return None
     
+    def map_to_commands_batch(self, inputs: List[str]) -> List[Optional[str]]:
+        """
+        Map several natural language inputs to system commands at once.
+        
+        The AI requests run concurrently, so a batch takes about as long as its
+        slowest request. Must not be called from a running event loop.
+        
+        Args:
+            inputs: Natural language commands
+            
+        Returns:
+            System command strings (or None) in the same order as inputs
+        """
+        return asyncio.run(self.map_to_commands_async(inputs))
+    
+    def open_async_client(self):
+        """
+        Create an AsyncOpenAI client for map_to_commands_async.
+        
+        The client owns a keep-alive pool bound to the calling event loop, so a
+        long-lived loop can create it once and reuse it for every batch.
+        
+        Returns:
+            AsyncOpenAI client, or None when AI is disabled
+        """
+        if not self.use_ai:
+            return None
+        return _async_openai_client(self._api_key)
+    
+    async def map_to_commands_async(self, inputs: List[str], client=None) -> List[Optional[str]]:
+        """
+        Map several natural language inputs to system commands concurrently.
+        
+        Args:
+            inputs: Natural language commands
+            client: Client from open_async_client to reuse; a temporary one is opened if omitted
+            
+        Returns:
+            System command strings (or None) in the same order as inputs
+        """
+        if not self.use_ai:
+            return [self.map_to_command(user_input) for user_input in inputs]
+        
+        if client is None:
+            async with self.open_async_client() as client:
+                return await self.map_to_commands_async(inputs, client)
+        
+        return await asyncio.gather(*(
+            self._map_to_command_async(user_input, client) for user_input in inputs
+        ))
+    
+    async def _map_to_command_async(self, user_input: str, client) -> Optional[str]:
+        """Async variant of map_to_command."""
+        user_input = sys.intern(user_input.strip().lower())
+        
+        ai_command = await self._ai_map_command_async(user_input, client)
+        if ai_command:
+            return ai_command
+        
+        return self._fallback_map_command(user_input)
+    
     def map_to_command_with_correction(self, user_input: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
         """
         Map natural language input to a system command with spell correction.
@@ -110,6 +768,9 @@ class CommandMapper:
         if exact_command:
             return exact_command, user_input, None
         
+        if not self._use_correction:
+            return None, user_input, None
+        
         # Try spell correction
         corrected_input = self._correct_spelling(user_input)
         if corrected_input and corrected_input != user_input:
@@ -129,89 +790,40 @@ class CommandMapper:
         Returns:
             Corrected input or None if no correction found
         """
-        # Known command keywords and their variations
-        command_keywords = {
-            # Redis commands
-            "redis": ["redis", "reddis", "reds"],
-            "sentinel": ["sentinel", "snetinel", "sental", "snetal", "snatel"],
-            "server": ["server", "srever", "srvr"],
-            "start": ["start", "sttart", "sart", "satrt"],
-            "stop": ["stop", "sttop", "stp"],
-            "restart": ["restart", "resttart", "restrt"],
-            
-            # Common system commands
-            "check": ["check", "chek", "chck"],
-            "status": ["status", "sttus", "staus"],
-            "memory": ["memory", "memry", "memmory"],
-            "ram": ["ram", "rm"],
-            "cpu": ["cpu", "cuppu"],
-            "disk": ["disk", "dsk"],
-            "network": ["network", "netwrok", "netwrk"],
-            "wifi": ["wifi", "wifi", "wifi"],
-            "port": ["port", "prt"],
-            "process": ["process", "proces", "prcess"],
-            "file": ["file", "fil"],
-            "folder": ["folder", "flder", "foler"],
-            "copy": ["copy", "cpy", "coppy"],
-            "move": ["move", "mov", "mve"],
-            "delete": ["delete", "delte", "dlete"],
-            "rename": ["rename", "renme", "renam"],
-            "create": ["create", "creat", "crate"],
-            "open": ["open", "opn", "ope"],
-            "search": ["search", "serch", "seach"],
-            "google": ["google", "googl", "gogle"],
-            "youtube": ["youtube", "youtub", "yutube"],
-            "gmail": ["gmail", "gmal", "gmil"],
-            "facebook": ["facebook", "facebok", "fcebook"],
-            "twitter": ["twitter", "twtter", "twiter"],
-            "instagram": ["instagram", "instgram", "instagrm"],
-            "spotify": ["spotify", "spotfy", "spotif"],
-            "reddit": ["reddit", "redit", "redd"],
-            "whatsapp": ["whatsapp", "whatsap", "whatspp"],
-            "shutdown": ["shutdown", "shutdwn", "shutdn"],
-            "restart": ["restart", "resttart", "restrt"],
-            "clear": ["clear", "clr", "cler"],
-            "system": ["system", "systm", "sysem"],
-            "info": ["info", "inf", "infor"],
-            "usage": ["usage", "usge", "usag"],
-            "connect": ["connect", "conect", "connct"],
-            "disconnect": ["disconnect", "disconect", "disconnct"],
-            "list": ["list", "lst", "lits"],
-            "available": ["available", "availble", "availabl"],
-            "networks": ["networks", "netwrks", "netwks"],
-            "calculator": ["calculator", "calc", "calcltr"],
-            "notepad": ["notepad", "notepd", "notepd"],
-            "chrome": ["chrome", "chrm", "chome"],
-            "firefox": ["firefox", "firef", "firefx"],
-            "safari": ["safari", "safri", "safr"],
-            "vscode": ["vscode", "vscd", "vsc"],
-            "weather": ["weather", "wether", "weathr"],
-            "time": ["time", "tim", "tme"],
-            "date": ["date", "dat", "dte"],
-        }
-        
         words = user_input.split()
         corrected_words = []
         
         for word in words:
             # Check if word needs correction
-            if word in command_keywords:
+            if word in _COMMAND_KEYWORDS:
+                corrected_words.append(word)
+                continue
+            
+            if len(word) < 3:  # Only correct words with 3+ characters
                 corrected_words.append(word)
                 continue
             
+            # Known misspellings need no similarity scoring
+            if word in _VARIATION_TO_KEYWORD:
+                corrected_words.append(_VARIATION_TO_KEYWORD[word])
+                continue
+            
             # Find the best match for this word
             best_match = None
             best_ratio = 0.8  # Minimum similarity threshold
             
-            for correct_word, variations in command_keywords.items():
-                # Check against the correct word and its variations
-                all_variations = [correct_word] + variations
-                for variation in all_variations:
-                    if len(word) >= 3 and len(variation) >= 3:  # Only correct words with 3+ characters
-                        similarity = self._string_similarity(word, variation)
-                        if similarity > best_ratio:
-                            best_ratio = similarity
-                            best_match = correct_word
+            if fuzz_process:
+                # One C-level scan over all variations, skipping those under the threshold
+                hit = fuzz_process.extractOne(word, _VARIATIONS, scorer=fuzz.ratio,
+                                              score_cutoff=best_ratio * 100)
+                if hit and hit[1] > best_ratio * 100:
+                    best_match = _VARIATION_TO_KEYWORD[hit[0]]
+            else:
+                for variation, correct_word in _VARIATION_TO_KEYWORD.items():
+                    similarity = self._string_similarity(word, variation)
+                    if similarity > best_ratio:
+                        best_ratio = similarity
+                        best_match = correct_word
             
             if best_match:
                 corrected_words.append(best_match)
@@ -223,7 +835,7 @@ class CommandMapper:
     
     def _string_similarity(self, a: str, b: str) -> float:
         """
-        Calculate string similarity using difflib.
+        Calculate string similarity using rapidfuzz, or difflib without it.
         
         Args:
             a: First string
@@ -232,7 +844,8 @@ class CommandMapper:
         Returns:
             Similarity ratio (0.0 to 1.0)
         """
-        from difflib import SequenceMatcher
+        if fuzz:
+            return fuzz.ratio(a, b) / 100.0
         return SequenceMatcher(None, a, b).ratio()
     
     def _ai_map_command(self, user_input: str) -> Optional[str]:
@@ -240,104 +853,171 @@ class CommandMapper:
         try:
             system_prompt = self._get_system_prompt()
             
-            response = openai.ChatCompletion.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": f"Convert this to a system command: {user_input}"}
-                ],
-                max_tokens=100,
-                temperature=0.1
-            )
-            
-            command = response.choices[0].message.content.strip()
-            
-            # Validate the command
-            if self._is_safe_command(command):
-                return command
-            else:
-                print(f"AI generated unsafe command: {command}")
-                return None
+            # Repeated inputs are answered from the cache without a network round trip
+            command = _ai_completion(self._api_key, self.model, system_prompt, f"Convert this to a system command: {user_input}")
+            return self._validate_ai_command(command)
                 
         except Exception as e:
-            print(f"AI mapping failed: {e}")
+            logger.warning("AI mapping failed: %s", e)
+            return None
+    
+    async def _ai_map_command_async(self, user_input: str, client) -> Optional[str]:
+        """Use AI to map command without blocking the event loop."""
+        try:
+            command = await _ai_completion_async(
+                client, self.model, self._get_system_prompt(),
+                f"Convert this to a system command: {user_input}"
+            )
+            return self._validate_ai_command(command)
+        
+        except Exception as e:
+            logger.warning("AI mapping failed: %s", e)
+            return None
+    
+    def _validate_ai_command(self, command: str) -> Optional[str]:
+        """Return an AI generated command if it is safe, otherwise None."""
+        if self._is_safe_command(command):
+            return command
+        else:
+            logger.warning("AI generated unsafe command: %s", command)
             return None
     
     def _get_system_prompt(self) -> str:
         """Get the system prompt for AI."""
-        return f"""
-You are a command line assistant that converts natural language to system commands.
-Current platform: {self.system}
-
-Rules:
-1. Return ONLY the command, no explanations
-2. Use platform-appropriate commands
-3. For macOS, use 'open -a' for applications
-4. For Windows, use 'start' for applications
-5. For Linux, use direct command names
-6. For web searches, return a command that opens the browser
-7. Be safe - avoid dangerous commands like 'rm -rf /'
+        return self._system_prompt
+    
+    def _build_system_prompt(self) -> str:
+        """Build the system prompt: the shared static text first, platform details last."""
+        chrome_command = self.apps.get('chrome', 'open -a "Google Chrome"')
+        return f"""{_SYSTEM_PROMPT_PREFIX}- "open chrome" → {chrome_command}
 
-Examples:
-- "open chrome" → {self.app_mappings.get('chrome', {}).get(self.system, 'open -a "Google Chrome"')}
-- "list ports with 8085" → lsof -i tcp:8085
-- "kill port 8085" → kill -9 $(lsof -t -i tcp:8085)
-- "search for weather" → open "https://www.google.com/search?q=weather"
-- "show date" → date
-- "check wifi" → networksetup -getinfo Wi-Fi (macOS) or ipconfig (Windows) or iwconfig (Linux)
+Current platform: {self.system}
 """
     
     def _fallback_map_command(self, user_input: str) -> Optional[str]:
-        """Use pattern matching as fallback."""
-        for pattern, mapping in self.fallback_patterns.items():
-            match = re.search(pattern, user_input, re.IGNORECASE)
+        """Use pattern matching as fallback; user_input must already be lower-cased."""
+        command = self._phrase_commands.get(user_input)
+        if command is not None:
+            return command
+        
+        if self._pattern_db is not None:
+            index = self._scan_pattern_db(user_input)
+            if index is None:
+                return None
+            
+            pattern, command = self._compiled_patterns[index]
+            if command.__class__ is str:
+                return command
+            # Re-run the winning pattern alone to get its own capture groups
+            return command(pattern.search(user_input))
+        
+        candidates = range(len(self._compiled_patterns))
+        if self._literal_filter is not None:
+            automaton, unanchored = self._literal_filter
+            hits = set(unanchored)
+            for _, indices in automaton.iter(user_input):
+                hits.update(indices)
+            candidates = sorted(hits)
+        
+        # Without the database, the first match already carries the capture groups
+        for index in candidates:
+            pattern, command = self._compiled_patterns[index]
+            match = pattern.search(user_input)
             if match:
-                command = mapping.get(self.system, mapping.get("all"))
-                if callable(command):
-                    return command(match)
-                elif command:
-                    return command
+                return command if command.__class__ is str else command(match)
         return None
     
+    def _scan_pattern_db(self, user_input: str) -> Optional[int]:
+        """Return the index of the first fallback pattern matching the input."""
+        hits = []
+        with self._pattern_db_lock:  # The database's scratch space is not thread-safe
+            self._pattern_db.scan(
+                user_input.encode("utf-8"),
+                match_event_handler=lambda pattern_id, *args: hits.append(pattern_id)
+            )
+        return min(hits) if hits else None
+    
+    def _compile_pattern_db(self):
+        """Compile the fallback patterns into a hyperscan database, if hyperscan is installed."""
+        if not hyperscan:
+            return None
+        
+        flags = hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP
+        try:
+            database = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+            database.compile(
+                expressions=[pattern.pattern.encode("utf-8") for pattern, _ in self._compiled_patterns],
+                ids=list(range(len(self._compiled_patterns))),
+                elements=len(self._compiled_patterns),
+                flags=[flags] * len(self._compiled_patterns)
+            )
+        except hyperscan.error:
+            return None  # Fall back to scanning the compiled patterns one by one
+        return database
+    
+    def _build_literal_filter(self):
+        """Index the fallback patterns by a literal they require, if pyahocorasick is installed.
+        
+        Returns an (automaton, unanchored) pair: the automaton maps each literal to the
+        patterns requiring it, and unanchored holds the patterns without a usable literal.
+        """
+        if not ahocorasick:
+            return None
+        
+        by_literal: Dict[str, List[int]] = {}
+        unanchored = []
+        for index, (pattern, _) in enumerate(self._compiled_patterns):
+            literal = _required_literal(pattern.pattern)
+            if len(literal) >= 3:
+                by_literal.setdefault(literal, []).append(index)
+            else:
+                unanchored.append(index)
+        
+        automaton = ahocorasick.Automaton()
+        for literal, indices in by_literal.items():
+            automaton.add_word(literal, tuple(indices))
+        automaton.make_automaton()
+        return automaton, tuple(unanchored)
+    
     def _load_fallback_patterns(self) -> Dict[str, Dict[str, str]]:
         """Load fallback pattern mappings."""
         return {
             # Port operations
             r"list.*port.*(\d{4,5})": {
-                "all": lambda m: f"lsof -i tcp:{m.group(1)}"
+                "all": _template("lsof -i tcp:{}")
             },
             r"kill.*port.*(\d{4,5})": {
-                "all": lambda m: f"kill -9 $(lsof -t -i tcp:{m.group(1)})"
+                "all": _template("kill -9 $(lsof -t -i tcp:{})")
             },
             r"find.*port.*(\d{4,5})": {
-                "all": lambda m: f"lsof -i tcp:{m.group(1)}"
+                "all": _template("lsof -i tcp:{}")
             },
             
             # File operations (from training data)
             r"copy\s+file\s+(\S+)\s+to\s+(\S+)": {
-                "darwin": lambda m: f"cp {m.group(1)} {m.group(2)}",
-                "windows": lambda m: f"copy {m.group(1)} {m.group(2)}",
-                "linux": lambda m: f"cp {m.group(1)} {m.group(2)}"
+                "darwin": _template("cp {} {}"),
+                "windows": _template("copy {} {}"),
+                "linux": _template("cp {} {}")
             },
             r"move\s+file\s+(\S+)\s+to\s+(\S+)": {
-                "darwin": lambda m: f"mv {m.group(1)} {m.group(2)}",
-                "windows": lambda m: f"move {m.group(1)} {m.group(2)}",
-                "linux": lambda m: f"mv {m.group(1)} {m.group(2)}"
+                "darwin": _template("mv {} {}"),
+                "windows": _template("move {} {}"),
+                "linux": _template("mv {} {}")
             },
             r"rename\s+(\S+)\s+to\s+(\S+)": {
-                "darwin": lambda m: f"mv {m.group(1)} {m.group(2)}",
-                "windows": lambda m: f"rename {m.group(1)} {m.group(2)}",
-                "linux": lambda m: f"mv {m.group(1)} {m.group(2)}"
+                "darwin": _template("mv {} {}"),
+                "windows": _template("rename {} {}"),
+                "linux": _template("mv {} {}")
             },
             r"(create|make)\s+(a\s+)?(new\s+)?folder\s+called\s+(\S+)": {
-                "darwin": lambda m: f"mkdir {m.group(4)}",
-                "windows": lambda m: f"mkdir {m.group(4)}",
-                "linux": lambda m: f"mkdir {m.group(4)}"
+                "darwin": _template("mkdir {3}"),
+                "windows": _template("mkdir {3}"),
+                "linux": _template("mkdir {3}")
             },
             r"(remove|delete)\s+folder\s+(\S+)": {
-                "darwin": lambda m: f"rmdir {m.group(2)}",
-                "windows": lambda m: f"rmdir {m.group(2)}",
-                "linux": lambda m: f"rmdir {m.group(2)}"
+                "darwin": _template("rmdir {1}"),
+                "windows": _template("rmdir {1}"),
+                "linux": _template("rmdir {1}")
             },
             
             # Application opening
@@ -373,83 +1053,32 @@ Examples:
             },
             
             # Web applications (from training data)
-            r"(open|launch|go\s+to)\s+youtube": {
-                "darwin": "open https://www.youtube.com",
-                "windows": "start https://www.youtube.com",
-                "linux": "xdg-open https://www.youtube.com"
-            },
-            r"search\s+youtube\s+for\s+(.+)": {
-                "darwin": lambda m: f'open https://www.youtube.com/results?search_query={m.group(1).replace(" ", "+")}',
-                "windows": lambda m: f'start https://www.youtube.com/results?search_query={m.group(1).replace(" ", "+")}',
-                "linux": lambda m: f'xdg-open https://www.youtube.com/results?search_query={m.group(1).replace(" ", "+")}'
-            },
-            r"(open|launch|check)\s+gmail": {
-                "darwin": "open https://mail.google.com",
-                "windows": "start https://mail.google.com",
-                "linux": "xdg-open https://mail.google.com"
-            },
-            r"(open|launch|go\s+to)\s+facebook": {
-                "darwin": "open https://www.facebook.com",
-                "windows": "start https://www.facebook.com",
-                "linux": "xdg-open https://www.facebook.com"
-            },
-            r"(open|launch|go\s+to)\s+instagram": {
-                "darwin": "open https://www.instagram.com",
-                "windows": "start https://www.instagram.com",
-                "linux": "xdg-open https://www.instagram.com"
-            },
-            r"(open|launch|go\s+to)\s+twitter": {
-                "darwin": "open https://twitter.com",
-                "windows": "start https://twitter.com",
-                "linux": "xdg-open https://twitter.com"
-            },
-            r"(tweet|send\s+a\s+tweet)\s+[""'](.+)[""']": {
-                "darwin": lambda m: f'open https://twitter.com/intent/tweet?text={m.group(2).replace(" ", "+")}',
-                "windows": lambda m: f'start https://twitter.com/intent/tweet?text={m.group(2).replace(" ", "+")}',
-                "linux": lambda m: f'xdg-open https://twitter.com/intent/tweet?text={m.group(2).replace(" ", "+")}'
-            },
-            r"(open|launch|play)\s+spotify": {
-                "darwin": "open https://open.spotify.com",
-                "windows": "start https://open.spotify.com",
-                "linux": "xdg-open https://open.spotify.com"
-            },
-            r"search\s+spotify\s+for\s+(.+)": {
-                "darwin": lambda m: f'open https://open.spotify.com/search/{m.group(1).replace(" ", "%20")}',
-                "windows": lambda m: f'start https://open.spotify.com/search/{m.group(1).replace(" ", "%20")}',
-                "linux": lambda m: f'xdg-open https://open.spotify.com/search/{m.group(1).replace(" ", "%20")}'
-            },
-            r"(open|launch|go\s+to)\s+reddit": {
-                "darwin": "open https://www.reddit.com",
-                "windows": "start https://www.reddit.com",
-                "linux": "xdg-open https://www.reddit.com"
-            },
-            r"search\s+reddit\s+for\s+(.+)": {
-                "darwin": lambda m: f'open https://www.reddit.com/search/?q={m.group(1).replace(" ", "+")}',
-                "windows": lambda m: f'start https://www.reddit.com/search/?q={m.group(1).replace(" ", "+")}',
-                "linux": lambda m: f'xdg-open https://www.reddit.com/search/?q={m.group(1).replace(" ", "+")}'
-            },
-            r"(open|launch)\s+whatsapp\s+web": {
-                "darwin": "open https://web.whatsapp.com",
-                "windows": "start https://web.whatsapp.com",
-                "linux": "xdg-open https://web.whatsapp.com"
-            },
+            _WEB_TARGET_PATTERN: _web_mapping(
+                lambda m: WEB_TARGETS[" ".join(m.group(2).split())]
+            ),
+            r"search\s+youtube\s+for\s+(.+)": _web_mapping(
+                lambda m: f'https://www.youtube.com/results?search_query={quote_plus(m.group(1))}'
+            ),
+            r"(tweet|send\s+a\s+tweet)\s+[""'](.+)[""']": _web_mapping(
+                lambda m: f'https://twitter.com/intent/tweet?text={quote_plus(m.group(2))}'
+            ),
+            r"search\s+spotify\s+for\s+(.+)": _web_mapping(
+                lambda m: f'https://open.spotify.com/search/{quote(m.group(1), safe="")}'
+            ),
+            r"search\s+reddit\s+for\s+(.+)": _web_mapping(
+                lambda m: f'https://www.reddit.com/search/?q={quote_plus(m.group(1))}'
+            ),
             
             # Web searches
-            r"search.*weather.*in\s+([a-zA-Z\s]+)": {
-                "darwin": lambda m: f'open https://www.google.com/search?q=weather+in+{m.group(1).replace(" ", "+")}',
-                "windows": lambda m: f'start https://www.google.com/search?q=weather+in+{m.group(1).replace(" ", "+")}',
-                "linux": lambda m: f'xdg-open https://www.google.com/search?q=weather+in+{m.group(1).replace(" ", "+")}'
-            },
-            r"search.*for\s+([a-zA-Z\s]+)": {
-                "darwin": lambda m: f'open https://www.google.com/search?q={m.group(1).replace(" ", "+")}',
-                "windows": lambda m: f'start https://www.google.com/search?q={m.group(1).replace(" ", "+")}',
-                "linux": lambda m: f'xdg-open https://www.google.com/search?q={m.group(1).replace(" ", "+")}'
-            },
-            r"google\s+([a-zA-Z\s]+)": {
-                "darwin": lambda m: f'open https://www.google.com/search?q={m.group(1).replace(" ", "+")}',
-                "windows": lambda m: f'start https://www.google.com/search?q={m.group(1).replace(" ", "+")}',
-                "linux": lambda m: f'xdg-open https://www.google.com/search?q={m.group(1).replace(" ", "+")}'
-            },
+            r"search.*weather.*in\s+([a-zA-Z\s]+)": _web_mapping(
+                lambda m: f'https://www.google.com/search?q=weather+in+{quote_plus(m.group(1))}'
+            ),
+            r"search.*for\s+([a-zA-Z\s]+)": _web_mapping(
+                lambda m: f'https://www.google.com/search?q={quote_plus(m.group(1))}'
+            ),
+            r"google\s+([a-zA-Z\s]+)": _web_mapping(
+                lambda m: f'https://www.google.com/search?q={quote_plus(m.group(1))}'
+            ),
             
             # System operations (from training data)
             r"shutdown\s+(my\s+)?computer": {
@@ -495,9 +1124,9 @@ Examples:
             
             # Network operations (from training data)
             r"connect\s+(to\s+)?wifi\s+(\S+)": {
-                "darwin": lambda m: f"networksetup -setairportnetwork en0 {m.group(2)}",
-                "windows": lambda m: f'netsh wlan connect name="{m.group(2)}"',
-                "linux": lambda m: f"nmcli device wifi connect {m.group(2)}"
+                "darwin": _template("networksetup -setairportnetwork en0 {1}"),
+                "windows": _template('netsh wlan connect name="{1}"'),
+                "linux": _template("nmcli device wifi connect {1}")
             },
             r"disconnect\s+(from\s+)?wifi": {
                 "darwin": "networksetup -setairportpower en0 off",
@@ -623,7 +1252,7 @@ Examples:
                 "all": "ps aux"
             },
             r"kill.*process.*(\d+)": {
-                "all": lambda m: f"kill -9 {m.group(1)}"
+                "all": _template("kill -9 {}")
             },
             
             # System control
@@ -680,48 +1309,56 @@ Examples:
                 "all": "kafka-topics --list --bootstrap-server localhost:9092"
             },
             r"delete.*kafka.*topic.*(\S+)": {
-                "all": lambda m: f"kafka-topics --bootstrap-server localhost:9092 --delete --topic {m.group(1)}"
+                "all": _template("kafka-topics --bootstrap-server localhost:9092 --delete --topic {}")
             },
             r"delete.*topic.*(\S+)": {
-                "all": lambda m: f"kafka-topics --bootstrap-server localhost:9092 --delete --topic {m.group(1)}"
+                "all": _template("kafka-topics --bootstrap-server localhost:9092 --delete --topic {}")
             }
         }
     
     def _is_safe_command(self, command: str) -> bool:
         """Check if a command is safe to execute."""
-        dangerous_patterns = [
-            r"rm\s+-rf\s+/",
-            r"dd\s+if=/dev/zero",
-            r":\(\)\{\s*:\|:\s*&\s*\};:",
-            r"mkfs\.",
-            r"fdisk",
-            r"parted",
-            r"sudo\s+rm\s+-rf",
-            r"sudo\s+dd",
-            r"sudo\s+mkfs",
-            r"sudo\s+fdisk",
-            r"sudo\s+parted"
-        ]
-        
-        for pattern in dangerous_patterns:
-            if re.search(pattern, command, re.IGNORECASE):
-                return False
-        
-        return True
+        return _DANGEROUS_RE.search(command.lower()) is None
     
     def get_available_commands(self) -> List[str]:
         """Get list of available commands for help."""
-        commands = []
-        for pattern, mapping in self.fallback_patterns.items():
-            if isinstance(mapping, dict):
-                command = mapping.get(self.system, mapping.get("all"))
-                if command and not callable(command):
-                    commands.append(command)
-        
-        return sorted(list(set(commands)))
+        return self.available_commands
+    
+    @cached_property
+    def available_commands(self) -> List[str]:
+        """Sorted commands available on this platform, built once on first use."""
+        # _compiled_patterns already holds just this platform's commands
+        commands = set(self._web_target_commands().values())
+        commands.update(command for _, command in self._compiled_patterns if not callable(command))
+        return sorted(commands)
+    
+    def _web_target_commands(self) -> Dict[str, str]:
+        """Browser commands for each WEB_TARGETS site on this platform."""
+        opener = _URL_OPENERS.get(self.system)
+        if not opener:
+            return {}
+        return {name: f"{opener} {url}" for name, url in WEB_TARGETS.items()}
+    
+    def _web_target_help(self) -> List[Dict[str, str]]:
+        """Help entries for the WEB_TARGETS sites, in get_commands_by_category's format."""
+        entries = []
+        for name, command in self._web_target_commands().items():
+            pattern = _WEB_TARGET_VERBS + r"\s+" + name.replace(" ", r"\s+")
+            entries.append({
+                "pattern": pattern,
+                "description": self._extract_description_from_pattern(pattern),
+                "command": command,
+                "example": f"open {name}"
+            })
+        return entries
     
     def get_commands_by_category(self) -> Dict[str, List[Dict[str, str]]]:
         """Get all available commands organized by category."""
+        return self.commands_by_category
+    
+    @cached_property
+    def commands_by_category(self) -> Dict[str, List[Dict[str, str]]]:
+        """Help entries for this platform grouped by category, built once on first use."""
         categories = {
             "System Information": [],
             "File Operations": [],
@@ -737,278 +1374,40 @@ Examples:
             "Port Operations": []
         }
         
-        # Define category mappings for patterns
-        category_patterns = {
-            "System Information": [
-                r"check\s+system\s+info",
-                r"check\s+cpu\s+usage",
-                r"check\s+(memory|ram)\s+(usage|status)",
-                r"disk.*space",
-                r"memory.*usage",
-                r"cpu.*usage"
-            ],
-            "File Operations": [
-                r"copy\s+file",
-                r"move\s+file",
-                r"rename",
-                r"(create|make).*folder",
-                r"(remove|delete)\s+folder",
-                r"list.*files",
-                r"show.*files",
-                r"current.*directory",
-                r"where.*am.*i"
-            ],
-            "Network & WiFi": [
-                r"connect.*wifi",
-                r"disconnect.*wifi",
-                r"list.*available.*wifi",
-                r"check.*wifi",
-                r"wifi.*status",
-                r"network.*status"
-            ],
-            "Applications": [
-                r"open.*chrome",
-                r"open.*firefox",
-                r"open.*vscode",
-                r"open.*safari",
-                r"start\s+notepad",
-                r"open\s+calculator"
-            ],
-            "Web Services": [
-                r"(open|launch|go\s+to)\s+youtube",
-                r"search\s+youtube",
-                r"(open|launch|check)\s+gmail",
-                r"(open|launch|go\s+to)\s+facebook",
-                r"(open|launch|go\s+to)\s+instagram",
-                r"(open|launch|go\s+to)\s+twitter",
-                r"(tweet|send\s+a\s+tweet)",
-                r"(open|launch|play)\s+spotify",
-                r"search\s+spotify",
-                r"(open|launch|go\s+to)\s+reddit",
-                r"search\s+reddit",
-                r"(open|launch)\s+whatsapp\s+web",
-                r"search.*weather",
-                r"search.*for",
-                r"google"
-            ],
-            "Redis Operations": [
-                r"start\s+redis\s+sentinel",
-                r"start\s+redis\s+server",
-                r"stop\s+redis",
-                r"restart\s+redis",
-                r"check\s+redis\s+status",
-                r"check\s+redis\s+sentinel\s+status"
-            ],
-            "Zookeeper Operations": [
-                r"start.*zookeeper"
-            ],
-            "Kafka Operations": [
-                r"start.*kafka",
-                r"list.*kafka.*topics",
-                r"show.*kafka.*topics",
-                r"delete.*kafka.*topic",
-                r"delete.*topic"
-            ],
-            "Process Management": [
-                r"list.*processes",
-                r"show.*processes",
-                r"kill.*process"
-            ],
-            "System Control": [
-                r"shutdown.*computer",
-                r"restart.*computer",
-                r"sleep.*computer",
-                r"clear\s+the\s+screen"
-            ],
-            "Date & Time": [
-                r"show.*date",
-                r"show.*me.*date",
-                r"show.*today.*date",
-                r"what.*date",
-                r"current.*time",
-                r"what.*time",
-                r"display.*date",
-                r"display.*time",
-                r"today.*date",
-                r"check\s+date\s+and\s+time"
-            ],
-            "Port Operations": [
-                r"list.*port",
-                r"kill.*port",
-                r"find.*port"
-            ]
-        }
-        
-        # Process each pattern and categorize it
-        for pattern, mapping in self.fallback_patterns.items():
-            if isinstance(mapping, dict):
-                command = mapping.get(self.system, mapping.get("all"))
-                if command:
-                    # Find which category this pattern belongs to
-                    category_found = False
-                    for category, patterns in category_patterns.items():
-                        for cat_pattern in patterns:
-                            # Use exact pattern matching instead of regex search
-                            if pattern == cat_pattern:
-                                # Extract a human-readable description from the pattern
-                                description = self._extract_description_from_pattern(pattern)
-                                categories[category].append({
-                                    "pattern": pattern,
-                                    "description": description,
-                                    "command": command if not callable(command) else "Dynamic command",
-                                    "example": self._get_example_from_pattern(pattern)
-                                })
-                                category_found = True
-                                break
-                        if category_found:
-                            break
-                    
-                    # If no category found, add to "Other"
-                    if not category_found:
-                        if "Other" not in categories:
-                            categories["Other"] = []
-                        description = self._extract_description_from_pattern(pattern)
-                        categories["Other"].append({
-                            "pattern": pattern,
-                            "description": description,
-                            "command": command if not callable(command) else "Dynamic command",
-                            "example": self._get_example_from_pattern(pattern)
-                        })
+        # Process each pattern with a command on this platform and categorize it
+        for compiled, command in self._compiled_patterns:
+            pattern = compiled.pattern
+            if pattern == _WEB_TARGET_PATTERN:
+                # One pattern serves every site; list each separately
+                categories["Web Services"].extend(self._web_target_help())
+                continue
+            category = _PATTERN_CATEGORY.get(pattern, "Other")
+            categories.setdefault(category, []).append({
+                "pattern": pattern,
+                "description": self._extract_description_from_pattern(pattern),
+                "command": command if not callable(command) else "Dynamic command",
+                "example": _PATTERN_EXAMPLES.get(pattern, "Try the command")
+            })
         
         # Remove empty categories
         return {k: v for k, v in categories.items() if v}
     
     def _extract_description_from_pattern(self, pattern: str) -> str:
         """Extract a human-readable description from a regex pattern."""
-        # Remove regex syntax and make it readable
-        description = pattern.replace(r"\s+", " ").replace(r"\d+", "NUMBER").replace(r"\S+", "FILENAME")
-        description = description.replace(r"(\S+)", "FILENAME").replace(r"(\d+)", "NUMBER").replace(r"(\d{4,5})", "PORT")
-        description = description.replace(r"([a-zA-Z\s]+)", "TEXT").replace(r"(.+)", "TEXT")
-        description = description.replace(r"[""'](.+)[""']", "TEXT")
-        description = description.replace(r"(\S+)", "FILENAME").replace(r"(\d+)", "NUMBER")
-        
-        # Clean up common patterns
-        description = description.replace(".*", " ").replace("\\s+", " ").replace("\\d+", "NUMBER")
-        description = description.replace("\\S+", "FILENAME").replace("\\w+", "WORD")
-        
-        # Make it more readable
-        description = description.replace("_", " ").replace("-", " ")
+        # Remove regex syntax and make it readable, in one pass over the pattern
+        description = _DESCRIPTION_RE.sub(lambda m: _DESCRIPTION_TOKENS[m.group()], pattern)
         description = " ".join(description.split())  # Remove extra spaces
         
         return description.title()
-    
-    def _get_example_from_pattern(self, pattern: str) -> str:
-        """Get an example input from a pattern."""
-        examples = {
-            # Port Operations
-            r"list.*port.*(\d{4,5})": "list all ports with 8085",
-            r"kill.*port.*(\d{4,5})": "kill port 8085",
-            r"find.*port.*(\d{4,5})": "find port 8085",
-            
-            # System Information
-            r"check\s+cpu\s+usage": "check cpu usage",
-            r"check\s+(memory|ram)\s+(usage|status)": "check RAM status",
-            r"check\s+(memory|ram)\s+usage": "check RAM usage",
-            r"check\s+(memory|ram)\s+status": "check RAM status",
-            r"check\s+system\s+info": "check system info",
-            r"disk.*space": "check disk space",
-            r"memory.*usage": "check memory usage",
-            r"cpu.*usage": "check cpu usage",
-            
-            # File Operations
-            r"copy\s+file\s+(\S+)\s+to\s+(\S+)": "copy file source.txt to destination.txt",
-            r"move\s+file\s+(\S+)\s+to\s+(\S+)": "move file source.txt to destination.txt",
-            r"rename\s+(\S+)\s+to\s+(\S+)": "rename oldname.txt to newname.txt",
-            r"(create|make)\s+(a\s+)?(new\s+)?folder\s+called\s+(\S+)": "create folder my_folder",
-            r"(remove|delete)\s+folder\s+(\S+)": "delete folder my_folder",
-            r"list.*files": "list files in current directory",
-            r"show.*files": "show files in current directory",
-            r"current.*directory": "show current directory",
-            r"where.*am.*i": "where am i",
-            
-            # Applications
-            r"open.*chrome": "open chrome",
-            r"open.*firefox": "open firefox",
-            r"open.*vscode": "open vscode",
-            r"open.*safari": "open safari",
-            r"start\s+notepad": "start notepad",
-            r"open\s+calculator": "open calculator",
-            
-            # Network & WiFi
-            r"connect.*wifi.*(\S+)": "connect to wifi MyNetwork",
-            r"connect\s+(to\s+)?wifi\s+(\S+)": "connect to wifi MyNetwork",
-            r"disconnect\s+(from\s+)?wifi": "disconnect from wifi",
-            r"list\s+available\s+wifi\s+networks": "list available wifi networks",
-            r"check.*wifi": "check wifi status",
-            r"wifi.*status": "check wifi status",
-            r"network.*status": "check network status",
-            
-            # Web Services
-            r"(open|launch|go\s+to)\s+youtube": "open youtube",
-            r"search\s+youtube\s+for\s+(.+)": "search youtube for music",
-            r"(open|launch|check)\s+gmail": "open gmail",
-            r"(open|launch|go\s+to)\s+facebook": "open facebook",
-            r"(open|launch|go\s+to)\s+instagram": "open instagram",
-            r"(open|launch|go\s+to)\s+twitter": "open twitter",
-            r"(tweet|send\s+a\s+tweet)\s+['](.+)[']": "tweet 'Hello world!'",
-            r"(open|launch|play)\s+spotify": "open spotify",
-            r"search\s+spotify\s+for\s+(.+)": "search spotify for songs",
-            r"(open|launch|go\s+to)\s+reddit": "open reddit",
-            r"search\s+reddit\s+for\s+(.+)": "search reddit for programming",
-            r"(open|launch)\s+whatsapp\s+web": "open whatsapp web",
-            r"search.*weather.*in\s+([a-zA-Z\s]+)": "search for weather in London",
-            r"search.*for\s+([a-zA-Z\s]+)": "search for python tutorial",
-            r"google\s+([a-zA-Z\s]+)": "google machine learning",
-            
-            # Redis Operations
-            r"start\s+redis\s+sentinel": "start redis sentinel",
-            r"start\s+redis\s+server": "start redis server",
-            r"stop\s+redis": "stop redis",
-            r"restart\s+redis": "restart redis",
-            r"check\s+redis\s+status": "check redis status",
-            r"check\s+redis\s+sentinel\s+status": "check redis sentinel status",
-            
-            # Zookeeper Operations
-            r"start.*zookeeper": "start zookeeper",
-            
-            # Kafka Operations
-            r"start.*kafka": "start kafka",
-            r"list.*kafka.*topics": "list kafka topics",
-            r"show.*kafka.*topics": "show kafka topics",
-            r"delete.*kafka.*topic.*(\S+)": "delete kafka topic my_topic",
-            r"delete.*topic.*(\S+)": "delete topic my_topic",
-            
-            # Process Management
-            r"list.*processes": "list processes",
-            r"show.*processes": "show processes",
-            r"kill.*process.*(\d+)": "kill process 1234",
-            
-            # System Control
-            r"shutdown.*computer": "shutdown my computer",
-            r"shutdown\s+(my\s+)?computer": "shutdown my computer",
-            r"restart.*computer": "restart my computer",
-            r"restart\s+(my\s+)?(pc|computer)": "restart my computer",
-            r"clear\s+the\s+screen": "clear the screen",
-            r"sleep.*computer": "sleep computer",
-            
-            # Date & Time
-            r"show.*date": "show me today's date",
-            r"show.*me.*date": "show me today's date",
-            r"show.*today.*date": "show today's date",
-            r"what.*date": "what date is it",
-            r"current.*time": "what time is it",
-            r"what.*time": "what time is it",
-            r"display.*date": "display current date",
-            r"display.*time": "display current time",
-            r"today.*date": "show today's date",
-            r"check\s+date\s+and\s+time": "check date and time",
-            
-            # Command Listing
-            r"list.*all.*commands": "list all commands",
-            r"show.*all.*commands": "show all commands",
-            r"help.*commands": "help commands",
-            r"list.*redis.*commands": "list redis commands",
-            r"show.*redis.*commands": "show redis commands"
-        }
-        
-        return examples.get(pattern, "Try the command") 
\ No newline at end of file
+
+_DEFAULT_MAPPER: Optional[CommandMapper] = None
+_DEFAULT_MAPPER_LOCK = threading.Lock()
+
+def get_default_mapper() -> CommandMapper:
+    """Return the process-wide CommandMapper with the default API key and model."""
+    global _DEFAULT_MAPPER
+    if _DEFAULT_MAPPER is None:
+        with _DEFAULT_MAPPER_LOCK:
+            if _DEFAULT_MAPPER is None:
+                _DEFAULT_MAPPER = CommandMapper()
+    return _DEFAULT_MAPPER
@@ -6,13 +6,57 @@ command history for the user.
 """
 
 import os
+import re
+import shlex
 import subprocess
 import json
 import datetime
+from collections import deque
 from typing import Optional, Dict, List
 from dataclasses import dataclass
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Keys every history entry carries; decodable lines without them are skipped on load
+_ENTRY_KEYS = frozenset(("timestamp", "original_input", "command", "success", "execution_time"))
+
+def _dumps(entry: Dict) -> bytes:
+    """Serialize a history entry to a newline-terminated JSON line."""
+    if orjson:
+        try:
+            return orjson.dumps(entry) + b"\n"
+        except TypeError:
+            pass  # e.g. lone surrogates from undecodable input bytes, which json escapes
+    return json.dumps(entry).encode("utf-8") + b"\n"
+
+def _loads(line: bytes) -> Dict:
+    """Deserialize a JSON line written by _dumps."""
+    if orjson:
+        try:
+            return orjson.loads(line)
+        except json.JSONDecodeError:
+            pass  # orjson rejects the escaped surrogates json writes; let json decide
+    return json.loads(line)
+
+# Pipes, redirects, chaining, substitution, globs and expansions all need a shell
+_NEEDS_SHELL = re.compile(r"[|&;<>()$`\\*?\[\]{}~!#%\n]")
+
+def _split_command(command: str) -> Optional[List[str]]:
+    """Split command into argv, or return None if it has to go through a shell."""
+    if os.name == "nt" or _NEEDS_SHELL.search(command):
+        return None
+    try:
+        argv = shlex.split(command)
+    except ValueError:
+        return None
+    if not argv or "=" in argv[0]:  # Leading VAR=value assignments are shell syntax
+        return None
+    return argv
+
 @dataclass
 class ExecutionResult:
     """Result of command execution."""
@@ -25,10 +69,15 @@ class ExecutionResult:
 class CommandExecutor:
     """Executes system commands safely and maintains history."""
     
-    def __init__(self, history_file: str = "command_history.json"):
+    def __init__(self, history_file: str = "command_history.jsonl", max_history: int = 100):
         self.history_file = Path(history_file)
+        self.max_history = max_history
         self.history = self._load_history()
         
+        # Running totals over self.history, so statistics never rescan it
+        self._successful = sum(1 for entry in self.history if entry["success"])
+        self._total_time = sum(entry["execution_time"] for entry in self.history)
+        
         # Dangerous commands that require confirmation
         self.dangerous_commands = [
             "rm -rf",
@@ -50,6 +99,7 @@ class CommandExecutor:
             "sudo groupadd",
             "sudo groupdel"
         ]
+        self._dangerous_re = re.compile("|".join(re.escape(dangerous.lower()) for dangerous in self.dangerous_commands))
     
     def execute(self, command: str, original_input: str = "") -> ExecutionResult:
         """
@@ -74,13 +124,7 @@ class CommandExecutor:
         
         try:
             # Execute the command
-            result = subprocess.run(
-                command,
-                shell=True,
-                capture_output=True,
-                text=True,
-                timeout=30  # 30 second timeout
-            )
+            result = self._run(command)
             
             execution_time = time.time() - start_time
             
@@ -109,25 +153,51 @@ class CommandExecutor:
                 error=f"Execution error: {str(e)}"
             )
     
+    def _run(self, command: str) -> subprocess.CompletedProcess:
+        """Run command with a 30 second timeout, exec'ing it directly when it needs no shell."""
+        argv = _split_command(command)
+        if argv:
+            try:
+                return subprocess.run(argv, capture_output=True, text=True, timeout=30)
+            except OSError:
+                pass  # Not an executable on PATH (e.g. a shell builtin); let the shell report it
+        return subprocess.run(command, shell=True, capture_output=True, text=True, timeout=30)
+    
     def _is_dangerous_command(self, command: str) -> bool:
         """Check if a command is potentially dangerous."""
-        command_lower = command.lower()
+        return self._dangerous_re.search(command.lower()) is not None
+    
+    def _load_history(self) -> "deque[Dict]":
+        """Load the newest entries of the command history file, skipping lines that don't decode."""
+        history: "deque[Dict]" = deque(maxlen=self.max_history)
+        # None until the file has been read, so a failed read never triggers a compacting rewrite
+        self._lines_on_disk: Optional[int] = 0
+        self._torn_tail = False
+        if not self.history_file.exists():
+            return history
         
-        for dangerous in self.dangerous_commands:
-            if dangerous.lower() in command_lower:
-                return True
+        try:
+            data = self.history_file.read_bytes()
+        except IOError:
+            self._lines_on_disk = None
+            return history
         
-        return False
-    
-    def _load_history(self) -> List[Dict]:
-        """Load command history from file."""
-        if self.history_file.exists():
+        lines = [line for line in data.splitlines() if line.strip()]
+        # Newest first, so a bad line doesn't cost one of the kept entries
+        for line in reversed(lines):
+            if len(history) == self.max_history:
+                break
             try:
-                with open(self.history_file, 'r') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, IOError):
-                return []
-        return []
+                entry = _loads(line)
+            except ValueError:
+                continue  # Torn or corrupt line, e.g. from a crash mid-append
+            if isinstance(entry, dict) and _ENTRY_KEYS <= entry.keys():
+                history.appendleft(entry)
+        
+        self._lines_on_disk = len(lines)
+        # A crash mid-append leaves a partial last line; the next append must not run on from it
+        self._torn_tail = bool(data) and not data.endswith(b"\n")
+        return history
     
     def _save_to_history(self, command: str, original_input: str, result: ExecutionResult):
         """Save command execution to history."""
@@ -142,16 +212,28 @@ class CommandExecutor:
             "error_length": len(result.error) if result.error else 0
         }
         
+        # The deque drops the oldest entry once max_history is reached
+        if len(self.history) == self.max_history:
+            dropped = self.history[0]
+            self._successful -= dropped["success"]
+            self._total_time -= dropped["execution_time"]
         self.history.append(history_entry)
+        self._successful += history_entry["success"]
+        self._total_time += history_entry["execution_time"]
         
-        # Keep only last 100 entries
-        if len(self.history) > 100:
-            self.history = self.history[-100:]
-        
-        # Save to file
+        # Append one line; once the file holds twice the kept entries, rewrite it with just those
         try:
-            with open(self.history_file, 'w') as f:
-                json.dump(self.history, f, indent=2)
+            if self._lines_on_disk is not None and self._lines_on_disk >= 2 * self.max_history:
+                with open(self.history_file, 'wb') as f:
+                    f.write(b"".join(_dumps(entry) for entry in self.history))
+                self._lines_on_disk = len(self.history)
+                self._torn_tail = False
+            else:
+                with open(self.history_file, 'ab') as f:
+                    f.write((b"\n" if self._torn_tail else b"") + _dumps(history_entry))
+                self._torn_tail = False
+                if self._lines_on_disk is not None:
+                    self._lines_on_disk += 1
         except IOError:
             pass  # Silently fail if can't save history
     
@@ -164,8 +246,9 @@ class CommandExecutor:
         print(f"\nCommand History (last {min(limit, len(self.history))} entries):")
         print("-" * 80)
         
-        for entry in self.history[-limit:]:
-            timestamp = datetime.datetime.fromisoformat(entry["timestamp"]).strftime("%Y-%m-%d %H:%M:%S")
+        for entry in list(self.history)[-limit:]:
+            # Timestamps are stored via isoformat(), so the display form is a slice away
+            timestamp = entry["timestamp"][:19].replace("T", " ")
             status = "✓" if entry["success"] else "✗"
             
             print(f"{timestamp} {status} {entry['original_input']}")
@@ -176,7 +259,11 @@ class CommandExecutor:
     
     def clear_history(self):
         """Clear command history."""
-        self.history = []
+        self.history.clear()
+        self._successful = 0
+        self._total_time = 0.0
+        self._lines_on_disk = 0
+        self._torn_tail = False
         if self.history_file.exists():
             self.history_file.unlink()
         print("Command history cleared.")
@@ -193,14 +280,11 @@ class CommandExecutor:
             }
         
         total = len(self.history)
-        successful = sum(1 for entry in self.history if entry["success"])
-        failed = total - successful
-        avg_time = sum(entry["execution_time"] for entry in self.history) / total
         
         return {
             "total_commands": total,
-            "successful_commands": successful,
-            "failed_commands": failed,
-            "success_rate": (successful / total) * 100,
-            "average_execution_time": avg_time
+            "successful_commands": self._successful,
+            "failed_commands": total - self._successful,
+            "success_rate": (self._successful / total) * 100,
+            "average_execution_time": self._total_time / total
         } 
\ No newline at end of file
@@ -10,10 +10,12 @@ import sys
 import subprocess
 import webbrowser
 import time
-import socket
 import re
+import selectors
 from pathlib import Path
 
+from port_finder import find_free_port
+
 def check_dependencies():
     """Check if required dependencies are installed."""
     try:
@@ -41,17 +43,6 @@ def create_templates_directory():
     templates_dir.mkdir(exist_ok=True)
     return templates_dir.exists()
 
-def find_free_port(start_port=5000, max_attempts=100):
-    """Find a free port starting from start_port."""
-    for port in range(start_port, start_port + max_attempts):
-        try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                s.bind(('localhost', port))
-                return port
-        except OSError:
-            continue
-    raise RuntimeError(f"Could not find a free port in range {start_port}-{start_port + max_attempts}")
-
 def extract_port_from_output(output):
     """Extract port number from server output."""
     # Look for patterns like "Server starting on http://localhost:PORT"
@@ -60,6 +51,41 @@ def extract_port_from_output(output):
         return int(match.group(1))
     return None
 
+def iter_server_output(process, timeout):
+    """Yield the process's output lines as soon as they arrive, for at most timeout seconds."""
+    deadline = time.monotonic() + timeout
+    
+    if os.name == "nt":  # Windows pipes can't be waited on with select
+        while time.monotonic() < deadline:
+            line = process.stdout.readline()
+            if not line:
+                process.wait()
+                return
+            yield line
+        return
+    
+    fd = process.stdout.fileno()
+    os.set_blocking(fd, False)
+    pending = b""
+    with selectors.DefaultSelector() as selector:
+        selector.register(fd, selectors.EVENT_READ)
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not selector.select(remaining):
+                return
+            try:
+                chunk = os.read(fd, 65536)
+            except BlockingIOError:
+                continue
+            if not chunk:
+                # Output closed: the server is exiting
+                process.wait()
+                return
+            pending += chunk
+            *lines, pending = pending.split(b"\n")
+            for line in lines:
+                yield line.decode("utf-8", errors="replace")
+
 def launch_web_ui():
     """Launch the web UI."""
     print("🤖 AI Command Generator - Web UI")
@@ -95,6 +121,8 @@ def launch_web_ui():
     # Find a free port first
     try:
         free_port = find_free_port()
+        if free_port is None:
+            raise RuntimeError("Could not find a free port in range 5000-5100")
         print(f"🔍 Found free port: {free_port}")
     except RuntimeError as e:
         print(f"❌ Error finding free port: {e}")
@@ -115,24 +143,17 @@ def launch_web_ui():
         # Wait for server to start and extract port
         port = None
         max_wait = 10  # seconds
-        start_time = time.time()
         
-        while time.time() - start_time < max_wait:
-            if process.poll() is not None:
-                print("❌ Web UI process exited unexpectedly")
-                return False
-            
-            # Read output line by line
-            line = process.stdout.readline()
-            if line:
-                print(line.strip())
-                if not port:
-                    port = extract_port_from_output(line)
-                    if port:
-                        print(f"🌐 Server detected on port: {port}")
-                        break
-            
-            time.sleep(0.1)
+        for line in iter_server_output(process, max_wait):
+            print(line.strip())
+            port = extract_port_from_output(line)
+            if port:
+                print(f"🌐 Server detected on port: {port}")
+                break
+        
+        if not port and process.poll() is not None:
+            print("❌ Web UI process exited unexpectedly")
+            return False
         
         if not port:
             print(f"⚠️  Could not detect port, using fallback: {free_port}")
@@ -6,12 +6,9 @@ Converts natural language input to system commands using AI.
 """
 
 import sys
-import argparse
 from rich.console import Console
-from rich.prompt import Prompt
 from rich.panel import Panel
 from rich.text import Text
-from rich.syntax import Syntax
 import platform
 
 from command_mapper import CommandMapper
@@ -52,11 +49,13 @@ def print_help():
 
 def main():
     """Main application loop."""
+    import argparse
+    
     parser = argparse.ArgumentParser(description="AI Command Generator")
     parser.add_argument("--input", "-i", help="Direct input command")
     parser.add_argument("--interactive", "-t", action="store_true", help="Interactive mode")
     parser.add_argument("--api-key", help="OpenAI API key")
-    parser.add_argument("--model", default="gpt-3.5-turbo", help="OpenAI model to use")
+    parser.add_argument("--model", default="gpt-4o-mini", help="OpenAI model to use")
     
     args = parser.parse_args()
     
@@ -108,6 +107,10 @@ def process_command(user_input, command_mapper, executor):
             console.print("[red]Could not interpret the command. Please try rephrasing.[/red]")
             return
         
+        # Syntax highlighting pulls in pygments, so it is imported only once there's a command to show
+        from rich.syntax import Syntax
+        from rich.prompt import Prompt
+        
         # Display the mapped command
         console.print(f"[bold]Interpreted Command:[/bold]")
         syntax = Syntax(mapped_command, "bash", theme="monokai")
@@ -144,6 +147,8 @@ def process_command(user_input, command_mapper, executor):
 
 def interactive_mode(command_mapper, executor):
     """Run in interactive mode."""
+    from rich.prompt import Prompt
+    
     print_help()
     
     while True:
@@ -5,46 +5,238 @@ Port Finder Utility
 Utility script to find free ports and check port availability.
 """
 
+import errno
 import socket
 import sys
-from typing import List, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import FrozenSet, List, Optional, Tuple
 
-def find_free_port(start_port: int = 5000, max_attempts: int = 100) -> Optional[int]:
+try:
+    import liburing
+except ImportError:
+    liburing = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Probes bind the loopback address directly; binding 'localhost' resolves the name on every call
+_LOOPBACK = '127.0.0.1'
+
+# connect_ex results meaning nothing is listening (Windows reports the WSA code)
+_REFUSED = {errno.ECONNREFUSED, getattr(errno, "WSAECONNREFUSED", errno.ECONNREFUSED)}
+
+# Most ports probed per io_uring submission
+URING_BATCH_SIZE = 64
+
+# Listening ports read from /proc/net are reused for this many seconds
+LISTENING_CACHE_TTL = 0.5
+_listening_cache: Tuple[float, FrozenSet[int]] = (float("-inf"), frozenset())
+_busy_mask_cache: Tuple[Optional[FrozenSet[int]], object] = (None, None)
+
+def _probe_socket() -> socket.socket:
+    """Create a TCP socket for bind probes."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    # Ports lingering in TIME_WAIT are free for a server that sets SO_REUSEADDR, as Flask's does.
+    # Only Linux refuses such a bind while another socket listens on the port: on Windows the
+    # option lets the probe bind over a live listener, and on macOS/BSD a loopback bind succeeds
+    # next to a wildcard listener (e.g. AirPlay on *:5000).
+    if sys.platform.startswith("linux"):
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    return sock
+
+def _try_bind(port: int) -> bool:
+    """Return True if port can be bound on localhost."""
+    try:
+        with _probe_socket() as s:
+            s.bind((_LOOPBACK, port))
+            return True
+    except OSError:
+        return False
+
+def _first_bindable(ports) -> Optional[int]:
+    """Return the first of ports that can be bound on localhost, probing with a single socket."""
+    with _probe_socket() as s:
+        for port in ports:
+            try:
+                s.bind((_LOOPBACK, port))
+                return port
+            except OSError:
+                continue  # A failed bind leaves the socket unbound, so it can try the next port
+    return None
+
+def find_free_port(start_port: int = 5000, max_attempts: int = 100,
+                   max_workers: Optional[int] = None) -> Optional[int]:
     """
     Find a free port starting from start_port.
     
     Args:
         start_port: Starting port number to check
         max_attempts: Maximum number of ports to check
+        max_workers: Ports probed concurrently (default min(max_attempts, 32); 1 scans serially)
         
     Returns:
-        Free port number or None if no free port found
+        Lowest free port number or None if no free port found
     """
-    for port in range(start_port, start_port + max_attempts):
-        try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                s.bind(('localhost', port))
-                return port
-        except OSError:
-            continue
+    end_port = start_port + max_attempts
+    # The start port is usually free, and one bind is far cheaper than starting threads
+    if max_attempts <= 0:
+        return None
+    if _try_bind(start_port):
+        return start_port
+    
+    if max_workers is None:
+        max_workers = min(max_attempts, 32)
+    if max_workers <= 1:
+        return _first_bindable(range(start_port + 1, end_port))
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        # Probe a window of ports at a time so the lowest free one still wins
+        for window_start in range(start_port + 1, end_port, max_workers):
+            window = range(window_start, min(window_start + max_workers, end_port))
+            futures = {pool.submit(_try_bind, port): port for port in window}
+            free = [futures[future] for future in as_completed(futures) if future.result()]
+            if free:
+                return min(free)
     return None
 
-def check_port_availability(port: int) -> bool:
+def check_port_availability(port: int, fast: bool = False) -> bool:
     """
     Check if a specific port is available.
     
+    On Linux this means no TCP listener holds the port, on any address;
+    elsewhere it means the port can be bound on the loopback address.
+    
     Args:
         port: Port number to check
+        fast: Only check for a listener on the loopback address with a connect
+            probe; a port that is bound but not listening still counts as available
         
     Returns:
         True if port is available, False otherwise
     """
+    if fast:
+        return _nothing_listening(port)
+    if sys.platform.startswith("linux"):
+        try:
+            return port not in _linux_listening_ports()
+        except OSError:
+            pass  # /proc not mounted; fall back to a bind probe
+    return _try_bind(port)
+
+def _nothing_listening(port: int) -> bool:
+    """Return True if a TCP connect to port on the loopback address is refused."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        # A timeout makes the kernel report the refusal instead of a pending connect
+        s.settimeout(1.0)
+        return s.connect_ex((_LOOPBACK, port)) in _REFUSED
+
+def _linux_listening_ports() -> FrozenSet[int]:
+    """
+    Read the ports that have a TCP listener from /proc/net/tcp and /proc/net/tcp6.
+    
+    Returns:
+        Listening port numbers, reused for LISTENING_CACHE_TTL seconds
+    """
+    global _listening_cache
+    read_at, ports = _listening_cache
+    now = time.monotonic()
+    if now - read_at < LISTENING_CACHE_TTL:
+        return ports
+    
+    listening = set()
+    for path in ("/proc/net/tcp", "/proc/net/tcp6"):
+        try:
+            with open(path) as f:
+                next(f)  # Column headings
+                for line in f:
+                    # Fields: slot, local "ADDR:PORT" in hex, remote address, state, ...
+                    fields = line.split()
+                    if fields[3] == "0A":  # TCP_LISTEN
+                        listening.add(int(fields[1].rsplit(":", 1)[1], 16))
+        except FileNotFoundError:
+            if path == "/proc/net/tcp":
+                raise
+            # No tcp6 table when IPv6 is disabled
+    
+    ports = frozenset(listening)
+    _listening_cache = (now, ports)
+    return ports
+
+def _busy_mask_linux():
+    """
+    Build a boolean array over all 65536 ports that is True where a TCP listener holds the port.
+    
+    Returns:
+        The mask, rebuilt only when _linux_listening_ports rereads /proc
+    """
+    global _busy_mask_cache
+    ports = _linux_listening_ports()
+    cached_ports, mask = _busy_mask_cache
+    if cached_ports is not ports:
+        mask = np.zeros(65536, dtype=bool)
+        mask[np.fromiter(ports, dtype=np.int64, count=len(ports))] = True
+        _busy_mask_cache = (ports, mask)
+    return mask
+
+def _probe_ports_uring(ports: List[int]) -> List[int]:
+    """
+    Try to bind each port with a single batched io_uring submission.
+    
+    Args:
+        ports: Port numbers to check
+        
+    Returns:
+        The free ports, in the order given
+    """
+    sockets = [_probe_socket() for _ in ports]
+    # The kernel reads the addresses at submit time, so they must outlive the submission
+    addresses = [liburing.Sockaddr(socket.AF_INET, _LOOPBACK, port) for port in ports]
+    ring, cqe = liburing.Ring(), liburing.Cqe()
     try:
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            s.bind(('localhost', port))
-            return True
-    except OSError:
-        return False
+        liburing.io_uring_queue_init(len(ports), ring)
+        try:
+            for index, (sock, address) in enumerate(zip(sockets, addresses)):
+                sqe = liburing.io_uring_get_sqe(ring)
+                liburing.io_uring_prep_bind(sqe, sock.fileno(), address)
+                liburing.io_uring_sqe_set_data64(sqe, index)
+            liburing.io_uring_submit_and_wait(ring, len(ports))
+            
+            free = [False] * len(ports)
+            for _ in ports:
+                liburing.io_uring_wait_cqe(ring, cqe)
+                entry = cqe[0]
+                index = entry.user_data
+                try:
+                    free[index] = entry.res == 0
+                except OSError:
+                    pass  # Reading a failed result raises its errno; the port is taken
+                liburing.io_uring_cq_advance(ring, 1)
+            return [port for port, is_free in zip(ports, free) if is_free]
+        finally:
+            liburing.io_uring_queue_exit(ring)
+    finally:
+        for sock in sockets:
+            sock.close()
+
+def _bindable_ports(ports: List[int]) -> List[int]:
+    """
+    Bind-probe ports, batching the probes through io_uring where available.
+    
+    Args:
+        ports: Port numbers to check
+        
+    Returns:
+        The ports that could be bound, in the order given
+    """
+    if liburing and sys.platform.startswith("linux"):
+        try:
+            return _probe_ports_uring(ports)
+        except OSError:
+            pass  # io_uring unavailable (old kernel or blocked by seccomp); probe one port at a time
+    return [port for port in ports if _try_bind(port)]
 
 def find_multiple_free_ports(count: int = 5, start_port: int = 5000) -> List[int]:
     """
@@ -57,20 +249,23 @@ def find_multiple_free_ports(count: int = 5, start_port: int = 5000) -> List[int
     Returns:
         List of free port numbers
     """
-    free_ports = []
-    current_port = start_port
-    
-    while len(free_ports) < count:
-        port = find_free_port(current_port, 1)
-        if port:
-            free_ports.append(port)
-            current_port = port + 1
-        else:
-            current_port += 1
-            
-        if current_port > 65535:
-            break
+    first = max(start_port, 1)  # Binding port 0 asks the kernel for any free port
+    candidates = range(first, 65536)
+    if np is not None and sys.platform.startswith("linux"):
+        try:
+            # Skip ports with a listener up front; the bind probe below still confirms the rest
+            candidates = np.flatnonzero(~_busy_mask_linux()[first:]) + first
+        except OSError:
+            pass  # /proc not mounted; probe every port
     
+    free_ports = []
+    position = 0
+    while len(free_ports) < count and position < len(candidates):
+        # Most candidates are free, so probe about as many as are still needed
+        batch_size = min(count - len(free_ports), URING_BATCH_SIZE)
+        batch = [int(port) for port in candidates[position:position + batch_size]]
+        position += len(batch)
+        free_ports.extend(_bindable_ports(batch))
     return free_ports
 
 def main():
@@ -5,36 +5,83 @@ Redis Sentinel Manager - Intelligent Redis sentinel operations
 
 import subprocess
 import socket
+import selectors
+import errno
+import time
 import os
 import platform
 
+_SYSTEM = platform.system().lower()
+
+# Redis configuration directory per platform; Linux and Windows share the default
+_CONFIG_DIRS = {
+    "darwin": "/Users/lakshmikanthd/Downloads/redis-5.0.7",  # macOS
+}
+_DEFAULT_CONFIG_DIR = os.path.join(os.path.expanduser("~"), "Downloads", "redis-5.0.7")
+
+# connect_ex results meaning a non-blocking connect is still in progress
+_CONNECT_PENDING = {errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EAGAIN,
+                    getattr(errno, "WSAEWOULDBLOCK", errno.EWOULDBLOCK)}
+
 class RedisSentinelManager:
     """Manages Redis sentinel operations with proper error handling."""
     
     def __init__(self):
         # Cross-platform Redis configuration directory
-        system = platform.system().lower()
-        if system == "darwin":  # macOS
-            self.config_dir = "/Users/lakshmikanthd/Downloads/redis-5.0.7"
-        elif system == "windows":  # Windows
-            self.config_dir = os.path.join(os.path.expanduser("~"), "Downloads", "redis-5.0.7")
-        else:  # Linux
-            self.config_dir = os.path.join(os.path.expanduser("~"), "Downloads", "redis-5.0.7")
+        self.config_dir = _CONFIG_DIRS.get(_SYSTEM, _DEFAULT_CONFIG_DIR)
         
         self.sentinel_conf = os.path.join(self.config_dir, "sentinel.conf")
         self.sentinel_port = 26379  # Default Redis sentinel port
     
     def is_sentinel_running(self):
         """Check if Redis sentinel is currently running on port 26379."""
+        return self.is_any_sentinel_running([("localhost", self.sentinel_port)])
+    
+    def is_any_sentinel_running(self, hosts, timeout=1.0):
+        """
+        Check whether any of several sentinels accepts connections, probing them all at once.
+        
+        Args:
+            hosts: (host, port) pairs to probe
+            timeout: Seconds to wait for the slowest sentinel
+            
+        Returns:
+            True if at least one sentinel accepted a connection
+        """
+        selector = selectors.DefaultSelector()
+        sockets = []
         try:
-            # Try to connect to sentinel port
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(1)
-            result = sock.connect_ex(('localhost', self.sentinel_port))
-            sock.close()
-            return result == 0
-        except:
+            # Start every connect without waiting, then wait on all of them together
+            for host, port in hosts:
+                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                sockets.append(sock)
+                sock.setblocking(False)
+                try:
+                    result = sock.connect_ex((host, port))
+                except OSError:
+                    continue  # Host doesn't resolve or is unreachable; the others may still answer
+                if result == 0:
+                    return True
+                if result in _CONNECT_PENDING:
+                    selector.register(sock, selectors.EVENT_WRITE)
+            
+            deadline = time.monotonic() + timeout
+            while selector.get_map():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                for key, _ in selector.select(remaining):
+                    # Writable means the connect finished; SO_ERROR says whether it succeeded
+                    if key.fileobj.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0:
+                        return True
+                    selector.unregister(key.fileobj)
             return False
+        except OSError:
+            return False
+        finally:
+            selector.close()
+            for sock in sockets:
+                sock.close()
     
     def start_sentinel(self):
         """Start Redis sentinel if not already running."""
@@ -49,38 +96,68 @@ class RedisSentinelManager:
                 stderr=subprocess.PIPE
             )
             
-            # Wait a moment and check if it started successfully
-            import time
-            time.sleep(2)
-            
-            if self.is_sentinel_running():
-                return "Redis sentinel started successfully on port 26379"
-            else:
-                return "Failed to start Redis sentinel"
+            # Poll with exponential backoff (25ms, 50ms, ...) for up to the 2 seconds we used to sleep
+            deadline = time.monotonic() + 2.0
+            delay = 0.025
+            while True:
+                time.sleep(min(delay, max(deadline - time.monotonic(), 0)))
+                if self.is_sentinel_running():
+                    return "Redis sentinel started successfully on port 26379"
+                if time.monotonic() >= deadline:
+                    return "Failed to start Redis sentinel"
+                delay *= 2
                 
         except Exception as e:
             return f"Failed to start Redis sentinel: {str(e)}"
     
+    def _resp_cmd(self, *args, timeout=5):
+        """
+        Send one command to the sentinel over RESP and read its reply.
+        
+        Args:
+            *args: Command name and arguments
+            timeout: Socket timeout in seconds
+            
+        Returns:
+            The reply as a string, or None if the server closed the connection without one
+            
+        Raises:
+            RuntimeError: The server answered with an error reply
+        """
+        request = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            arg = str(arg).encode("utf-8")
+            request.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+        
+        with socket.create_connection(("localhost", self.sentinel_port), timeout=timeout) as sock:
+            sock.sendall(b"".join(request))
+            reply = sock.makefile("rb")
+            line = reply.readline()
+            if not line:
+                return None  # SHUTDOWN closes the connection instead of replying
+            kind, value = line[:1], line[1:].rstrip(b"\r\n").decode("utf-8", "replace")
+            if kind == b"-":
+                raise RuntimeError(value)
+            if kind == b"$":
+                length = int(value)
+                if length < 0:
+                    return None
+                return reply.read(length + 2)[:length].decode("utf-8", "replace")
+            return value
+    
     def stop_sentinel(self):
         """Stop Redis sentinel."""
         if not self.is_sentinel_running():
             return "Redis sentinel is not running"
         
         try:
-            # Use redis-cli to connect to sentinel and shutdown
-            result = subprocess.run(
-                ["redis-cli", "-p", "26379", "shutdown"],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if result.returncode == 0:
-                return "Redis sentinel stopped successfully"
-            else:
-                return f"Failed to stop Redis sentinel: {result.stderr}"
+            # Ask the sentinel to shut down over its own protocol
+            self._resp_cmd("SHUTDOWN", timeout=10)
+            return "Redis sentinel stopped successfully"
                 
-        except subprocess.TimeoutExpired:
+        except RuntimeError as e:
+            return f"Failed to stop Redis sentinel: {str(e)}"
+        except socket.timeout:
             return "Timeout while stopping Redis sentinel"
         except Exception as e:
             return f"Error stopping Redis sentinel: {str(e)}"
@@ -91,18 +168,11 @@ class RedisSentinelManager:
             return "Redis sentinel is not running"
         
         try:
-            result = subprocess.run(
-                ["redis-cli", "-p", "26379", "info", "server"],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            
-            if result.returncode == 0:
-                return f"Redis sentinel is running on port 26379\n{result.stdout}"
-            else:
-                return f"Failed to get sentinel status: {result.stderr}"
+            info = self._resp_cmd("INFO", "server")
+            return f"Redis sentinel is running on port 26379\n{info}"
                 
+        except RuntimeError as e:
+            return f"Failed to get sentinel status: {str(e)}"
         except Exception as e:
             return f"Error getting sentinel status: {str(e)}"
 
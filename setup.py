@@ -49,6 +49,17 @@ setup(
     ],
     python_requires=">=3.7",
     install_requires=read_requirements(),
+    extras_require={
+        "speedups": [
+            "orjson>=3.0.0",
+            "diskcache>=5.0.0",
+            "hyperscan>=0.4.0; platform_machine == 'x86_64' or platform_machine == 'AMD64'",
+            "google-re2>=1.0",
+            "pyahocorasick>=2.0.0",
+            "liburing; sys_platform == 'linux'",
+            "numpy>=1.17",
+        ],
+    },
     entry_points={
         "console_scripts": [
             "ai-command=main:main",
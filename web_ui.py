@@ -7,25 +7,36 @@ Flask web application providing a modern web interface for the AI Command Genera
 
 import os
 import sys
+import asyncio
+import concurrent.futures
 import json
+import re
 import datetime
-import socket
+import functools
+import threading
+from collections import deque
 from pathlib import Path
 from typing import Dict, List, Optional
 
 # Add the current directory to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from command_mapper import CommandMapper
+from command_mapper import get_default_mapper
 from executor import CommandExecutor
+from port_finder import find_free_port
 
 try:
-    from flask import Flask, render_template, request, jsonify, session
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from flask import Flask, Response, render_template, request, jsonify, session
     from flask_socketio import SocketIO, emit
 except ImportError:
     print("Flask not installed. Installing required packages...")
     os.system("pip install flask flask-socketio")
-    from flask import Flask, render_template, request, jsonify, session
+    from flask import Flask, Response, render_template, request, jsonify, session
     from flask_socketio import SocketIO, emit
 
 app = Flask(__name__)
@@ -33,11 +44,145 @@ app.config['SECRET_KEY'] = 'ai-command-generator-secret-key'
 socketio = SocketIO(app, cors_allowed_origins="*")
 
 # Initialize components
-command_mapper = CommandMapper()
+command_mapper = get_default_mapper()
 executor = CommandExecutor()
 
-# Chat history storage (in memory for web session)
-chat_history = []
+class _BatchQueue:
+    """Groups AI mapping requests from concurrent clients so they go out as one batch."""
+    
+    def __init__(self, mapper, max_batch: int = 8, max_wait: float = 0.02, timeout: float = 30.0):
+        self._mapper = mapper
+        self._max_batch = max_batch
+        self._max_wait = max_wait
+        self._timeout = timeout
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
+        # Created on the loop thread by _start
+        self._requests: Optional[asyncio.Queue] = None
+        self._batch_full: Optional[asyncio.Event] = None
+        self._client = None
+        self._dispatches: set = set()
+        # Requests currently inside map(), from any thread
+        self._in_flight = 0
+        self._in_flight_lock = threading.Lock()
+    
+    def map(self, normalized_input: str) -> Optional[str]:
+        """Map one input, batching it with requests that overlap it and waiting up to timeout seconds."""
+        with self._in_flight_lock:
+            alone = self._in_flight == 0
+            self._in_flight += 1
+        try:
+            if alone:
+                # Nothing to batch with, so skip the hop to the loop thread and the collection delay
+                return self._mapper.map_to_command(normalized_input)
+            
+            future = asyncio.run_coroutine_threadsafe(self._submit(normalized_input), self._get_loop())
+            try:
+                return future.result(timeout=self._timeout)
+            except concurrent.futures.TimeoutError:
+                future.cancel()
+                raise
+        finally:
+            with self._in_flight_lock:
+                self._in_flight -= 1
+    
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the event loop thread that collects and dispatches batches, once."""
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, daemon=True).start()
+                asyncio.run_coroutine_threadsafe(self._start(), loop).result()
+                self._loop = loop
+        return self._loop
+    
+    async def _start(self):
+        """Set up the queue and the long-lived AI client on the loop, then start collecting."""
+        self._requests = asyncio.Queue()
+        self._batch_full = asyncio.Event()
+        self._client = self._mapper.open_async_client()
+        asyncio.ensure_future(self._collect())
+    
+    async def _submit(self, normalized_input: str) -> Optional[str]:
+        """Queue an input and wait for its result."""
+        future = asyncio.get_running_loop().create_future()
+        self._requests.put_nowait((normalized_input, future))
+        if self._requests.qsize() >= self._max_batch:
+            self._batch_full.set()
+        return await future
+    
+    async def _collect(self):
+        """Gather requests for up to max_wait seconds or max_batch items, then dispatch them."""
+        while True:
+            batch = [await self._requests.get()]
+            try:
+                await asyncio.wait_for(self._batch_full.wait(), self._max_wait)
+            except asyncio.TimeoutError:
+                pass
+            self._batch_full.clear()
+            while len(batch) < self._max_batch and not self._requests.empty():
+                batch.append(self._requests.get_nowait())
+            if self._requests.qsize() >= self._max_batch:
+                self._batch_full.set()  # Another full batch is already waiting
+            # Dispatch as a task so a slow batch doesn't hold up the next one
+            task = asyncio.ensure_future(self._dispatch(batch))
+            self._dispatches.add(task)
+            task.add_done_callback(self._dispatches.discard)
+    
+    async def _dispatch(self, batch: List[tuple]):
+        """Map a batch and hand each caller its result."""
+        inputs = [normalized_input for normalized_input, _ in batch]
+        try:
+            commands = await self._mapper.map_to_commands_async(inputs, self._client)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), command in zip(batch, commands):
+            if not future.done():  # The caller timed out and cancelled it
+                future.set_result(command)
+
+_AI_BATCH = _BatchQueue(command_mapper)
+
+# Requests for the command listings, matched against lowercased input
+_LISTING_RE = re.compile("list all commands|show all commands|help commands")
+_REDIS_LISTING_RE = re.compile("list redis commands|show redis commands")
+
+class _HistoryStore:
+    """Chat history held as JSON fragments encoded once on append, so serving it never re-encodes entries."""
+    
+    def __init__(self, maxlen: int = 1000):
+        self._fragments: "deque[bytes]" = deque(maxlen=maxlen)
+        self._dump: Optional[bytes] = None
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        """Number of entries held."""
+        return len(self._fragments)
+    
+    def append(self, entry: Dict):
+        """Add an entry, dropping the oldest once maxlen is reached."""
+        fragment = orjson.dumps(entry) if orjson else json.dumps(entry).encode("utf-8")
+        with self._lock:
+            self._fragments.append(fragment)
+            self._dump = None
+    
+    def clear(self):
+        """Drop all entries."""
+        with self._lock:
+            self._fragments.clear()
+            self._dump = None
+    
+    def dump(self) -> bytes:
+        """The whole history as a JSON array, rebuilt only after it changes."""
+        with self._lock:
+            if self._dump is None:
+                self._dump = b"[" + b",".join(self._fragments) + b"]"
+            return self._dump
+
+# Chat history storage (in memory for web session); the oldest entries drop off past 1000
+chat_history = _HistoryStore(maxlen=1000)
 
 @app.route('/')
 def index():
@@ -73,12 +218,26 @@ def handle_message(data):
     # Emit response back to client
     emit('bot_response', result)
 
+@functools.lru_cache(maxsize=1024)
+def _cached_correction(normalized_input: str):
+    """Map a stripped, lowercased input with spell correction, remembering the result."""
+    return command_mapper.map_to_command_with_correction(normalized_input)
+
+def _map_input(normalized_input: str):
+    """Map a stripped, lowercased input with spell correction."""
+    if command_mapper.use_ai:
+        # The mapper skips spell correction when AI is on, so only the mapping itself remains.
+        # Successful AI answers are cached by the mapper; a failed request is retried next time.
+        return _AI_BATCH.map(normalized_input), normalized_input, None
+    return _cached_correction(normalized_input)
+
 def process_command(user_input: str) -> Dict:
     """Process a user command and return result."""
     try:
         # Map to command
-        # Use spell correction and mapping
-        mapped_command, original_input, suggested_correction = command_mapper.map_to_command_with_correction(user_input)
+        # Use spell correction and mapping; repeated inputs skip the AI round trip
+        lowered = user_input.lower()
+        mapped_command, original_input, suggested_correction = _map_input(lowered.strip())
         
         if not mapped_command:
             return {
@@ -95,8 +254,8 @@ def process_command(user_input: str) -> Dict:
         is_intelligent_command = mapped_command.startswith('python -c')
         
         # Check if this is a command listing request
-        is_command_listing = any(keyword in user_input.lower() for keyword in ['list all commands', 'show all commands', 'help commands'])
-        is_redis_listing = any(keyword in user_input.lower() for keyword in ['list redis commands', 'show redis commands'])
+        is_command_listing = _LISTING_RE.search(lowered) is not None
+        is_redis_listing = _REDIS_LISTING_RE.search(lowered) is not None
         
         # Check if there was a spelling correction
         if suggested_correction:
@@ -179,15 +338,20 @@ def execute_command():
 @app.route('/api/history')
 def get_history():
     """Get chat history."""
-    return jsonify(chat_history)
+    return Response(chat_history.dump(), mimetype='application/json')
 
 @app.route('/api/clear_history', methods=['POST'])
 def clear_history():
     """Clear chat history."""
-    global chat_history
-    chat_history = []
+    chat_history.clear()
     return jsonify({'message': 'History cleared'})
 
+@app.route('/api/clear_cache', methods=['POST'])
+def clear_cache():
+    """Forget cached command mappings."""
+    _cached_correction.cache_clear()
+    return jsonify({'message': 'Cache cleared'})
+
 @app.route('/api/help')
 def get_help():
     """Get help information."""
@@ -224,29 +388,32 @@ def get_help():
     }
     return jsonify(help_data)
 
+@functools.lru_cache(maxsize=None)
+def _commands_payload() -> Dict:
+    """Build the /api/commands response once; the command set never changes at runtime."""
+    categories = command_mapper.commands_by_category
+    
+    # Format the data for the frontend
+    formatted_categories = {}
+    for category, commands in categories.items():
+        formatted_categories[category] = []
+        for cmd in commands:
+            formatted_categories[category].append({
+                'example': cmd['example'],
+                'description': cmd['description'],
+                'command': cmd['command']
+            })
+    
+    return {
+        'categories': formatted_categories,
+        'total_commands': sum(len(cmds) for cmds in categories.values())
+    }
+
 @app.route('/api/commands')
 def get_commands():
     """Get all available commands organized by category."""
     try:
-        from command_mapper import CommandMapper
-        mapper = CommandMapper()
-        categories = mapper.get_commands_by_category()
-        
-        # Format the data for the frontend
-        formatted_categories = {}
-        for category, commands in categories.items():
-            formatted_categories[category] = []
-            for cmd in commands:
-                formatted_categories[category].append({
-                    'example': cmd['example'],
-                    'description': cmd['description'],
-                    'command': cmd['command']
-                })
-        
-        return jsonify({
-            'categories': formatted_categories,
-            'total_commands': sum(len(cmds) for cmds in categories.values())
-        })
+        return jsonify(_commands_payload())
     except Exception as e:
         return jsonify({
             'error': f'Error loading commands: {str(e)}',
@@ -254,17 +421,6 @@ def get_commands():
             'total_commands': 0
         })
 
-def find_free_port(start_port=5000, max_attempts=100):
-    """Find a free port starting from start_port."""
-    for port in range(start_port, start_port + max_attempts):
-        try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                s.bind(('localhost', port))
-                return port
-        except OSError:
-            continue
-    raise RuntimeError(f"Could not find a free port in range {start_port}-{start_port + max_attempts}")
-
 if __name__ == '__main__':
     # Create templates directory if it doesn't exist
     templates_dir = Path(__file__).parent / 'templates'
@@ -273,6 +429,8 @@ if __name__ == '__main__':
     # Find a free port
     try:
         port = find_free_port()
+        if port is None:
+            raise RuntimeError("Could not find a free port in range 5000-5100")
         print("🤖 AI Command Generator - Web UI")
         print("=" * 40)
         print(f"Platform: {command_mapper.system}")
@@ -280,7 +438,10 @@ if __name__ == '__main__':
         print(f"Server starting on http://localhost:{port}")
         print("Press Ctrl+C to stop")
         
-        socketio.run(app, debug=True, host='0.0.0.0', port=port)
+        # The debugger adds per-request overhead, so it is opt-in via FLASK_DEBUG=1.
+        # Flask-SocketIO picks eventlet or gevent automatically when one is installed.
+        debug = os.environ.get("FLASK_DEBUG", "0") == "1"
+        socketio.run(app, debug=debug, host='0.0.0.0', port=port, use_reloader=False)
     except RuntimeError as e:
         print(f"❌ Error: {e}")
         sys.exit(1) 
\ No newline at end of file